@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Offline batch scorer for quiz responses.
+
+Re-implements the enhanced matching in pages/api/matchCareer.js
+(extractUserTagsWithDomain, checkKnockoutRules, calculateEnhancedCareerScore)
+for scoring many response sets at once. The taxonomy is compiled once into a
+sparse tag x career weight matrix, so scoring a respondent is one sparse
+vector-matrix product followed by per-career arithmetic, and knockout rules are
+compiled into career bitmasks shared by every career with the same rule.
+
+`--verify` runs the production JavaScript on the repo's test profiles with Node
+and checks that both implementations produce the same ranked scores.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Any, Iterable, NamedTuple, Optional, Tuple
+
+from timeline_io import DATA_DIR
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+DOMAIN_TAGS = [
+    ('life_sciences_domain', 'life_sciences'),
+    ('physical_sciences_domain', 'physical_sciences'),
+    ('engineering_domain', 'engineering'),
+    ('mathematical_domain', 'mathematical'),
+    ('interdisciplinary_domain', 'interdisciplinary'),
+    ('social_sciences_domain', 'social_sciences')
+]
+TECHNICAL_CATEGORIES = ['data_science', 'software_engineering', 'ai_ml', 'biotech_engineering']
+TECHNICAL_SKILLS = {'experimental design', 'computational biology', 'data modeling',
+                    'machine learning', 'algorithms', 'programming', 'data analysis'}
+DEFAULT_CATEGORY_WEIGHTS = {'skills': 0.5, 'values': 0.3, 'temperament': 0.2}
+TECHNICAL_CATEGORY_WEIGHTS = {'skills': 0.7, 'values': 0.2, 'temperament': 0.1}
+MAX_COMPLEXITY_MULTIPLIER = 1.5
+LIST_REQUIREMENTS = {
+    'required_tools': 'data_tools_experience',
+    'required_languages': 'programming_languages',
+    'required_math_areas': 'mathematical_areas',
+    'required_methods': 'research_methodology',
+    'required_clinical': 'clinical_experience'
+}
+
+# Planes of the weight matrix: weighted sums and match counts per career
+SKILL_SUM, SKILL_TECH_SUM, SKILL_COUNT, VALUE_SUM, VALUE_COUNT, TEMPERAMENT_SUM, TEMPERAMENT_COUNT = range(7)
+PLANES = 7
+
+_LEADING_INT = re.compile(r'^\s*([+-]?\d+)')
+
+
+def js_parse_int(value: Any) -> Optional[int]:
+    """JavaScript parseInt(); None stands in for NaN."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, list):
+        value = ','.join(str(v) for v in value)
+    match = _LEADING_INT.match(str(value))
+    return int(match.group(1)) if match else None
+
+
+def js_truthy(value: Any) -> bool:
+    """JavaScript truthiness (empty lists and objects are truthy)."""
+    return value is not None and value is not False and value != 0 and value != ''
+
+
+def js_includes(container: Any, item: Any) -> bool:
+    """Array.prototype.includes / String.prototype.includes."""
+    if isinstance(container, str):
+        return isinstance(item, str) and item in container
+    return isinstance(container, list) and item in container
+
+
+def minimal_profile(career_id: str, career_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Same fallback as createMinimalCareerProfile for careers missing from both taxonomies."""
+    return {
+        'id': career_id,
+        'name': career_data.get('name'),
+        'category': 'General',
+        'domain_expertise': ['any'],
+        'skills': {
+            'required': ['analytical thinking', 'communication', 'problem-solving'],
+            'complexity_levels': {
+                'analytical thinking': 'intermediate',
+                'communication': 'basic',
+                'problem-solving': 'intermediate'
+            }
+        },
+        'values': ['impact', 'growth', 'innovation'],
+        'temperament': ['analytical', 'organized', 'adaptable']
+    }
+
+
+class Match(NamedTuple):
+    career: str
+    total: float
+    skills: float
+    values: float
+    temperament: float
+    domain_bonus: float
+
+
+class ScoringModel:
+    """Quiz scoring compiled for batch evaluation.
+
+    The input documents can be edited before construction (e.g. category_weights
+    or phd_domains) to sweep scoring parameters.
+    """
+
+    def __init__(self, quiz: Dict[str, Any], enhanced_taxonomy: Dict[str, Any],
+                 taxonomy: Dict[str, Any], timelines: Dict[str, Any]):
+        self.questions = {q['id']: q for q in reversed(quiz['questions'])}  # find() returns the first match
+        self.question_weights = quiz['scoring']['weights']
+        self.careers = list(timelines['career_timelines'].keys())
+        enhanced = {}
+        for career in reversed(enhanced_taxonomy['career_paths']):
+            enhanced[career['id']] = career
+        fallback = {}
+        for career in reversed(taxonomy['career_paths']):
+            fallback[career['id']] = career
+
+        n = len(self.careers)
+        self.matrix: Dict[str, List[Tuple[int, float, bool]]] = {}
+        self.skill_counts = [0] * n
+        self.has_skills = [False] * n
+        self.has_values = [False] * n
+        self.has_temperament = [False] * n
+        self.category_weights = []
+        domain_expertise = []
+        self.special_ip = None
+
+        for c, career_id in enumerate(self.careers):
+            profile = (enhanced.get(career_id) or fallback.get(career_id)
+                       or minimal_profile(career_id, timelines['career_timelines'][career_id]))
+            category = profile.get('category')
+            key = re.sub(r'\s+', '_', category.lower()) if category else 'general'
+            weights = enhanced_taxonomy['category_weights'].get(key) or DEFAULT_CATEGORY_WEIGHTS
+            if category and any(cat.replace('_', '', 1) in category.lower() for cat in TECHNICAL_CATEGORIES):
+                weights = TECHNICAL_CATEGORY_WEIGHTS
+            self.category_weights.append((weights['skills'], weights['values'], weights['temperament']))
+            domain_expertise.append(profile.get('domain_expertise'))
+            if profile.get('id') == 'intellectual_property_analyst':
+                self.special_ip = c
+
+            skills = profile.get('skills')
+            if skills:
+                self.has_skills[c] = True
+                skill_list = skills if isinstance(skills, list) else skills.get('required') or []
+                complexity = {} if isinstance(skills, list) else skills.get('complexity_levels') or {}
+                self.skill_counts[c] = len(skill_list)
+                for skill in skill_list:
+                    multiplier = 1.0
+                    level = complexity.get(skill)
+                    if level and level in enhanced_taxonomy['skill_complexity']:
+                        multiplier = min(enhanced_taxonomy['skill_complexity'][level]['multiplier'],
+                                         MAX_COMPLEXITY_MULTIPLIER)
+                    plane = SKILL_TECH_SUM if skill in TECHNICAL_SKILLS else SKILL_SUM
+                    self._add(skill, plane, c, multiplier, False)
+                    self._add(skill, SKILL_COUNT, c, 1.0, True)
+            for attribute, sum_plane, count_plane, flags in (
+                    ('values', VALUE_SUM, VALUE_COUNT, self.has_values),
+                    ('temperament', TEMPERAMENT_SUM, TEMPERAMENT_COUNT, self.has_temperament)):
+                items = profile.get(attribute) or []
+                flags[c] = len(items) > 0
+                for item in items:
+                    self._add(item, sum_plane, c, 1.0, False)
+                    self._add(item, count_plane, c, 1.0, True)
+
+        self.domain_bonus = self._compile_domain_bonuses(enhanced_taxonomy['phd_domains'], domain_expertise)
+        self.knockouts = self._compile_knockouts(quiz.get('knockout_rules') or {})
+        self.all_careers = (1 << n) - 1
+
+    @classmethod
+    def from_files(cls, data_dir: str = DATA_DIR) -> 'ScoringModel':
+        docs = []
+        for name in ('quizQuestions.json', 'enhanced_career_taxonomy.json', 'career_taxonomy.json',
+                     'careerTimelineData_PhDOptimized.json'):
+            with open(os.path.join(data_dir, name), 'r', encoding='utf-8') as f:
+                docs.append(json.load(f))
+        return cls(*docs)
+
+    def _add(self, tag: str, plane: int, career: int, weight: float, indicator: bool) -> None:
+        self.matrix.setdefault(tag, []).append((plane * len(self.careers) + career, weight, indicator))
+
+    def _compile_domain_bonuses(self, phd_domains: Dict[str, Any],
+                                domain_expertise: List[Any]) -> Dict[Optional[str], List[float]]:
+        """Domain bonus for every (user domain, career) pair."""
+        table = {None: [0.0] * len(self.careers)}
+        for _, domain in DOMAIN_TAGS:
+            row = []
+            for expertise in domain_expertise:
+                bonus = 0.0
+                if expertise:
+                    if domain in expertise or 'any_technical' in expertise:
+                        data = phd_domains.get(domain)
+                        bonus = data['bonus_multiplier'] - 1 if data else 0.15
+                    elif 'any' in expertise:
+                        bonus = 0.05
+                row.append(bonus)
+            table[domain] = row
+        return table
+
+    def _compile_knockouts(self, rules: Dict[str, Any]) -> List[Tuple[Tuple[str, str, Any], int]]:
+        """Distinct requirement -> bitmask of the careers it applies to."""
+        masks: Dict[Tuple[str, str, Any], int] = {}
+        for c, career_id in enumerate(self.careers):
+            career_rules = rules.get(career_id)
+            if not career_rules:
+                continue
+            requirements = []
+            for key, value in career_rules.items():
+                if key.endswith('_experience') or key.endswith('_background'):
+                    minimum = value.get('min') if isinstance(value, dict) else None
+                    requirements.append(('min', key, minimum))
+            if js_truthy(career_rules.get('phd_domain_1')):
+                requirements.append(('domain', 'phd_domain_1', tuple(career_rules['phd_domain_1'])))
+            for rule_key, answer_key in LIST_REQUIREMENTS.items():
+                if js_truthy(career_rules.get(rule_key)):
+                    requirements.append(('any', answer_key, tuple(career_rules[rule_key])))
+            for requirement in requirements:
+                masks[requirement] = masks.get(requirement, 0) | (1 << c)
+        return list(masks.items())
+
+    def qualifying_mask(self, answers: Dict[str, Any]) -> int:
+        """Bitmask of careers whose knockout rules the answers satisfy."""
+        failed = 0
+        for (kind, key, expected), mask in self.knockouts:
+            if kind == 'min':
+                passed = expected is not None and (js_parse_int(answers.get(key)) or 0) >= expected
+            elif kind == 'domain':
+                passed = answers.get(key) in expected
+            else:
+                given = answers.get(key) or []
+                passed = any(js_includes(given, item) for item in expected)
+            if not passed:
+                failed |= mask
+        return self.all_careers & ~failed
+
+    def user_tags(self, answers: Dict[str, Any]) -> Tuple[Dict[str, float], Optional[str]]:
+        """Weighted tags and PhD domain, as extractUserTagsWithDomain computes them."""
+        tags: Dict[str, float] = {}
+        domain = None
+        for question_id, answer in answers.items():
+            question = self.questions.get(question_id)
+            if question is None:
+                continue
+            weight = self.question_weights.get(question['category']) or 1
+            options = question.get('options') or []
+
+            def option(option_id):
+                return next((opt for opt in options if opt.get('id') == option_id), None)
+
+            if question_id == 'phd_domain_1':
+                selected = option(answer)
+                if selected:
+                    domain = next((name for tag, name in DOMAIN_TAGS if tag in selected.get('tags', [])), domain)
+
+            kind = question.get('type')
+            if kind == 'multiple_choice':
+                selected = option(answer)
+                for tag in (selected or {}).get('tags') or []:
+                    tags[tag] = tags.get(tag, 0) + weight
+            elif kind == 'multiple_select' and isinstance(answer, list):
+                for selected_id in answer:
+                    for tag in (option(selected_id) or {}).get('tags') or []:
+                        tags[tag] = tags.get(tag, 0) + weight
+            elif kind == 'ranking' and isinstance(answer, list):
+                for index, option_id in enumerate(answer):
+                    selected = option(option_id)
+                    if selected and selected.get('tags'):
+                        ranked = weight * ((len(answer) - index) / len(answer))
+                        for tag in selected['tags']:
+                            tags[tag] = tags.get(tag, 0) + ranked
+            elif kind == 'scale':
+                value = js_parse_int(answer)
+                scale_tags = (question.get('tags') or {}).get(str(value)) if value is not None else None
+                for tag in scale_tags or []:
+                    tags[tag] = tags.get(tag, 0) + weight
+        return tags, domain
+
+    def score(self, answers: Dict[str, Any]) -> List[Match]:
+        """Ranked matches with a positive score, best first."""
+        tags, domain = self.user_tags(answers)
+        mask = self.qualifying_mask(answers)
+        n = len(self.careers)
+
+        # Sparse user-tag row times the tag x (plane, career) weight matrix
+        max_tag = max(max(tags.values(), default=1), 1)
+        acc = [0.0] * (PLANES * n)
+        for tag, value in tags.items():
+            if not value:
+                continue
+            row = self.matrix.get(tag)
+            if row is None:
+                continue
+            normalized = value / max_tag
+            for index, weight, indicator in row:
+                acc[index] += 1.0 if indicator else normalized * weight
+
+        bonuses = self.domain_bonus.get(domain, self.domain_bonus[None])
+        matches = []
+        for c in range(n):
+            if not (mask >> c) & 1:
+                continue
+            bonus = bonuses[c]
+            skills = values = temperament = 0.0
+            matched = acc[SKILL_COUNT * n + c]
+            if self.has_skills[c] and matched > 0:
+                total = acc[SKILL_SUM * n + c] + acc[SKILL_TECH_SUM * n + c] * (1 + bonus * 0.6)
+                coverage = matched / self.skill_counts[c]
+                penalty = 0.5 if coverage < 0.3 else 0.75 if coverage < 0.5 else 1.0
+                skills = total / matched * penalty
+            matched = acc[VALUE_COUNT * n + c]
+            if self.has_values[c] and matched > 0:
+                values = acc[VALUE_SUM * n + c] / matched
+            matched = acc[TEMPERAMENT_COUNT * n + c]
+            if self.has_temperament[c] and matched > 0:
+                temperament = acc[TEMPERAMENT_SUM * n + c] / matched
+
+            w_skills, w_values, w_temperament = self.category_weights[c]
+            final = (skills * w_skills + values * w_values + temperament * w_temperament) * (1 + bonus)
+            if c == self.special_ip and not (tags.get('technical writing', 0) > 0 or
+                                             tags.get('patent law basics', 0) > 0 or
+                                             tags.get('research', 0) > 1):
+                final *= 0.3
+            final = max(0.0, min(1.0, final))
+            if final > 0:
+                matches.append(Match(self.careers[c], final, max(0.0, min(1.0, skills)),
+                                     max(0.0, min(1.0, values)), max(0.0, min(1.0, temperament)), bonus))
+        matches.sort(key=lambda m: -m.total)
+        return matches
+
+    def score_batch(self, respondents: Iterable[Dict[str, Any]]) -> Iterable[List[Match]]:
+        """Score many response sets with the same compiled model."""
+        for answers in respondents:
+            yield self.score(answers)
+
+
+# Loads the production handler's scoring functions outside Next.js and scores
+# every profile passed on argv: test-*-profile.js modules and JSON answer files.
+REFERENCE_HARNESS = r"""
+const fs = require('fs');
+const path = require('path');
+const [root, ...profileFiles] = process.argv.slice(1);
+let src = fs.readFileSync(path.join(root, 'pages/api/matchCareer.js'), 'utf8');
+src = src.replace(/^import\s+(\w+)\s+from\s+'\.\.\/\.\.\/data\/([\w.]+)';/gm,
+  (m, name, file) => `const ${name} = require(${JSON.stringify(path.join(root, 'data', file))});`);
+src = src.replace(/^export default /m, '') + '\nmodule.exports = { calculateCareerMatches };';
+const mod = { exports: {} };
+new Function('module', 'require', src)(mod, require);
+const results = [];
+for (const file of profileFiles) {
+  const loaded = file.endsWith('.js') ? require(file) : JSON.parse(fs.readFileSync(file, 'utf8'));
+  const profiles = file.endsWith('.js') ? Object.entries(loaded) : [[path.basename(file), loaded]];
+  for (const [name, answers] of profiles) {
+    const { matches } = mod.exports.calculateCareerMatches(answers);
+    results.push({ profile: name, answers, matches: matches.map(m => [m.careerPath, m.totalScore]) });
+  }
+}
+process.stdout.write(JSON.stringify(results));
+"""
+
+
+def reference_profiles() -> List[str]:
+    """The repo's existing test profiles."""
+    return (sorted(glob.glob(os.path.join(ROOT, 'test-*-profile.js'))) +
+            [os.path.join(ROOT, name) for name in ('simulated_responses.json', 'corrected_responses.json',
+                                                    'truly_corrected_responses.json')])
+
+
+def verify_against_reference(model: ScoringModel, tolerance: float = 1e-9) -> List[str]:
+    """Score the test profiles with both implementations. Returns a list of mismatches."""
+    output = subprocess.run(['node', '-e', REFERENCE_HARNESS, ROOT] + reference_profiles(),
+                            check=True, capture_output=True, text=True).stdout
+    problems = []
+    for case in json.loads(output):
+        expected = case['matches']
+        actual = [(m.career, m.total) for m in model.score(case['answers'])]
+        if [career for career, _ in expected] != [career for career, _ in actual]:
+            problems.append(f"{case['profile']}: ranking differs")
+            continue
+        worst = max((abs(a - e) for (_, a), (_, e) in zip(actual, expected)), default=0.0)
+        if worst > tolerance:
+            problems.append(f"{case['profile']}: scores differ by up to {worst:g}")
+    return problems
+
+
+def read_respondents(path: str) -> Iterable[Dict[str, Any]]:
+    """Answer sets from a JSON object, a JSON list, or a JSONL file ('-' for stdin)."""
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        text = f.read()
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    try:
+        document = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return document if isinstance(document, list) else [document]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Score answer sets in batch, or verify against the JavaScript implementation."""
+    parser = argparse.ArgumentParser(description='Batch quiz scoring over the enhanced career taxonomy.')
+    parser.add_argument('responses', nargs='?', help='answers as JSON object, JSON list or JSONL')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--top', type=int, default=8, help='matches to output per respondent')
+    parser.add_argument('--verify', action='store_true', help='compare with matchCareer.js on the test profiles')
+    args = parser.parse_args(argv)
+
+    model = ScoringModel.from_files(args.data_dir)
+
+    if args.verify:
+        problems = verify_against_reference(model)
+        for problem in problems:
+            print(problem)
+        print("Matches matchCareer.js" if not problems else f"{len(problems)} profiles differ")
+        if problems:
+            sys.exit(1)
+        return
+
+    if not args.responses:
+        parser.error('responses file required unless --verify is given')
+    for matches in model.score_batch(read_respondents(args.responses)):
+        print(json.dumps([{'careerPath': m.career, 'totalScore': m.total} for m in matches[:args.top]]))
+
+
+if __name__ == '__main__':
+    main()
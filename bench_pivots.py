@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the pivot tooling.
+
+Runs the core functions of count_pivots.py, enhance_pivots.py and
+restore_pivots.py against synthetic datasets (see synth_timelines.py) and
+reports throughput in careers/sec and peak RSS. Each benchmark runs in a fresh
+interpreter so peak RSS belongs to that benchmark alone.
+
+Throughput and memory depend on the machine, so baselines are local:
+--save-baseline writes bench_baseline.json (not tracked in git), and later
+runs on the same machine fail if throughput drops or memory grows past its
+thresholds. Without a baseline, or with one made by a different generator
+version, results are only reported.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Any, Optional
+
+import synth_timelines
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(ROOT, 'bench_baseline.json')
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'career-bench')
+DEFAULT_THRESHOLDS = {'throughput': 0.35, 'peak_rss': 0.25}
+MIN_SECONDS = 0.5
+MAX_PASSES = 50
+
+
+def peak_rss_bytes() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def bench_count(path: str):
+    """count_pivots_per_career, including its file load and report."""
+    from count_pivots import count_pivots_per_career
+    return len(load(path)['career_timelines']), lambda _: count_pivots_per_career(path), None
+
+
+def bench_enhance(path: str):
+    """enhance_career_pivots over every career of an already loaded dataset."""
+    from enhance_pivots import enhance_career_pivots
+    from pivot_rules import load_plan
+    careers = load(path)['career_timelines']
+    plan = load_plan()
+
+    def run(_):
+        for key, career_data in careers.items():
+            enhance_career_pivots(career_data, career_data.get('name', key), key, plan)
+    return len(careers), run, None
+
+
+def bench_create_pivot(path: str):
+    """create_pivot_opportunity for one template per career (the salary parsing hot path)."""
+    from enhance_pivots import create_pivot_opportunity
+    from pivot_rules import load_plan
+    careers = load(path)['career_timelines']
+    templates = [template for branches in load_plan().categories.values() for template in branches]
+
+    def run(_):
+        for i, career_data in enumerate(careers.values()):
+            template = templates[i % len(templates)]
+            create_pivot_opportunity(template, career_data['main_path'], template.index)
+    return len(careers), run, None
+
+
+def bench_restore(path: str):
+    """The restore_pivots per-career loop over an already loaded dataset."""
+    from career_categorizer import load_categorizer
+    from restore_pivots import restore_career_pivots
+    careers = load(path)['career_timelines']
+    categorizer = load_categorizer()
+
+    def run(fresh):
+        for key, career_data in (fresh or careers).items():
+            restore_career_pivots(key, career_data, categorizer)
+    # Restoring mutates its input, so passes after the first re-read the dataset untimed
+    return len(careers), run, lambda: load(path)['career_timelines']
+
+
+BENCHMARKS = {
+    'count': bench_count,
+    'enhance': bench_enhance,
+    'create_pivot': bench_create_pivot,
+    'restore': bench_restore,
+}
+
+
+def run_worker(name: str, path: str) -> Dict[str, Any]:
+    """Run one benchmark in this process; the scripts' own printing is discarded.
+
+    Each benchmark returns (careers, run, prepare). The timed run is repeated
+    until MIN_SECONDS have been spent so small datasets are not dominated by
+    timer noise, and the fastest pass is reported. prepare, if given, builds
+    the input of every pass but the first outside the timed section.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        careers, run, prepare = BENCHMARKS[name](path)
+        passes = []
+        state = None
+        while not passes or (sum(passes) < MIN_SECONDS and len(passes) < MAX_PASSES):
+            state = None  # let the previous pass's input go before building the next
+            state = prepare() if prepare and passes else None
+            start = time.perf_counter()
+            run(state)
+            passes.append(time.perf_counter() - start)
+    seconds = min(passes)
+    return {
+        'careers': careers,
+        'seconds': seconds,
+        'passes': len(passes),
+        'careers_per_sec': careers / seconds if seconds else 0.0,
+        'peak_rss_bytes': peak_rss_bytes()
+    }
+
+
+def run_benchmark(name: str, path: str, repeat: int = 1) -> Dict[str, Any]:
+    """Best of `repeat` runs, each in a fresh interpreter."""
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', name, path],
+                                cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        if best is None or result['careers_per_sec'] > best['careers_per_sec']:
+            best = result
+    return best
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Regressions of results against a baseline, as readable messages."""
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get('thresholds', {})}
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get('results', {}).get(case)
+        if base is None:
+            continue
+        floor = base['careers_per_sec'] * (1 - thresholds['throughput'])
+        if result['careers_per_sec'] < floor:
+            regressions.append(f"{case}: {result['careers_per_sec']:,.0f} careers/sec is below "
+                               f"{floor:,.0f} (baseline {base['careers_per_sec']:,.0f})")
+        ceiling = base['peak_rss_bytes'] * (1 + thresholds['peak_rss'])
+        if result['peak_rss_bytes'] > ceiling:
+            regressions.append(f"{case}: peak RSS {result['peak_rss_bytes'] / 1e6:,.1f} MB is above "
+                               f"{ceiling / 1e6:,.1f} MB (baseline {base['peak_rss_bytes'] / 1e6:,.1f} MB)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite and compare against (or save) the baseline."""
+    parser = argparse.ArgumentParser(description='Benchmark the pivot tooling on synthetic datasets.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(synth_timelines.DEFAULT_SIZES),
+                        help='synthetic dataset sizes in careers')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='benchmarks to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case; the fastest is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='where synthetic datasets are cached')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='write these results as the new baseline')
+    parser.add_argument('--worker', nargs=2, metavar=('BENCHMARK', 'DATASET'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return 0
+
+    results = {}
+    for size in args.sizes:
+        path = synth_timelines.write_dataset(args.data_dir, size, args.seed)
+        for name in args.only or BENCHMARKS:
+            case = f"{name}@{size}"
+            results[case] = run_benchmark(name, path, args.repeat)
+            print(f"{case}: {results[case]['careers_per_sec']:,.0f} careers/sec, "
+                  f"peak RSS {results[case]['peak_rss_bytes'] / 1e6:,.1f} MB")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            baseline = load(args.baseline)
+        baseline.setdefault('thresholds', dict(DEFAULT_THRESHOLDS))
+        baseline['generator_version'] = synth_timelines.GENERATOR_VERSION
+        baseline['python'] = sys.version.split()[0]
+        baseline.setdefault('results', {}).update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    baseline = load(args.baseline)
+    if baseline.get('generator_version') != synth_timelines.GENERATOR_VERSION:
+        print(f"{args.baseline} was recorded with synthetic generator v{baseline.get('generator_version')}, "
+              f"not v{synth_timelines.GENERATOR_VERSION}; run with --save-baseline to refresh it")
+        return 0
+    regressions = compare(results, baseline)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    print(f"{len(regressions)} regressions against {os.path.basename(args.baseline)}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
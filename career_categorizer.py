@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Compile the career category rules (career_categories.json) into a classifier
+shared by restore_pivots.py and enhance_pivots.py.
+
+A career is categorized from, in order: a per-key override, a single combined
+regex over its name, then weighted targetIndustries and taxonomy category
+signals. Compiled classifiers are shared by the content hash of the rule and
+taxonomy files, and each classifier caches its results per career input.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+
+CATEGORY_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'career_categories.json')
+
+_compiled: Dict[str, 'Categorizer'] = {}
+
+
+class Categorizer:
+    """Career category classifier compiled from a rule document."""
+
+    def __init__(self, raw: Dict[str, Any], taxonomy: Optional[Dict[str, Any]], digest: str):
+        self.version = str(raw.get('version', '0'))
+        self.digest = digest
+        self.priority: Tuple[str, ...] = tuple(raw['priority'])
+        self.fallback = raw.get('fallback', 'general')
+        self.min_score = raw.get('minScore', 1)
+        self.overrides = {key: category for category, keys in raw.get('overrides', {}).items() for key in keys}
+
+        # One anchored alternation with a lookahead per category, in priority order: the
+        # first branch whose keywords occur anywhere in the name matches, and its group
+        # name is the category
+        keywords = raw.get('nameKeywords', {})
+        branches = [f"(?=.*?(?P<{category}>{'|'.join(keywords[category])}))"
+                    for category in self.priority if keywords.get(category)]
+        self.name_pattern = re.compile('|'.join(branches), re.IGNORECASE | re.DOTALL) if branches else None
+
+        self.industry_weights: Dict[str, List[Tuple[str, float]]] = {}
+        for category, weights in raw.get('industryWeights', {}).items():
+            for industry, weight in weights.items():
+                self.industry_weights.setdefault(industry.lower(), []).append((category, weight))
+
+        category_weights = raw.get('taxonomy', {}).get('categoryWeights', {})
+        self.taxonomy_weights: Dict[str, List[Tuple[str, float]]] = {}
+        for career in (taxonomy or {}).get('career_paths', []):
+            weights = category_weights.get(career.get('category'), {})
+            if 'id' in career and weights:
+                self.taxonomy_weights[career['id']] = list(weights.items())
+
+        self._cache: Dict[Tuple[Any, ...], str] = {}
+
+    @property
+    def rules_version(self) -> str:
+        return f"{self.version}:{self.digest[:12]}"
+
+    def _name_category(self, name: str) -> Optional[str]:
+        if self.name_pattern is None:
+            return None
+        match = self.name_pattern.match(name)
+        return match.lastgroup if match else None
+
+    def _signal_category(self, career_key: Optional[str], industries: Tuple[str, ...]) -> Optional[str]:
+        scores: Dict[str, float] = {}
+        for industry in industries:
+            for category, weight in self.industry_weights.get(industry.lower(), ()):
+                scores[category] = scores.get(category, 0) + weight
+        for category, weight in self.taxonomy_weights.get(career_key, ()):
+            scores[category] = scores.get(category, 0) + weight
+        if not scores:
+            return None
+        best = max(scores.values())
+        leaders = [category for category, score in scores.items() if score == best]
+        return leaders[0] if best >= self.min_score and len(leaders) == 1 else None
+
+    def classify(self, career_key: Optional[str], career_data: Dict[str, Any], name: Optional[str] = None) -> str:
+        """Category of one career. name defaults to career_data['name'], then the key."""
+        name = name if name is not None else career_data.get('name', career_key or '')
+        industries = tuple(career_data.get('targetIndustries', []))
+        cache_key = (career_key, name, industries)
+        category = self._cache.get(cache_key)
+        if category is None:
+            category = (self.overrides.get(career_key)
+                        or self._name_category(name)
+                        or self._signal_category(career_key, industries)
+                        or self.fallback)
+            self._cache[cache_key] = category
+        return category
+
+    def classify_batch(self, careers: Mapping[str, Dict[str, Any]]) -> Dict[str, str]:
+        """Categories for a whole career_timelines mapping (or any subset of it)."""
+        return {career_key: self.classify(career_key, career_data) for career_key, career_data in careers.items()}
+
+
+@lru_cache(maxsize=None)
+def load_categorizer(rules_path: str = CATEGORY_RULES_PATH) -> Categorizer:
+    """Load and compile a rule file and its taxonomy. Cached per path for the process lifetime;
+    rule files with identical content share one compiled classifier and its result cache."""
+    with open(rules_path, 'rb') as f:
+        rules_bytes = f.read()
+    raw = json.loads(rules_bytes.decode('utf-8'))
+    digest = hashlib.sha256(rules_bytes)
+
+    taxonomy = None
+    taxonomy_path = raw.get('taxonomy', {}).get('path')
+    if taxonomy_path:
+        taxonomy_path = os.path.join(os.path.dirname(os.path.abspath(rules_path)), taxonomy_path)
+        with open(taxonomy_path, 'rb') as f:
+            taxonomy_bytes = f.read()
+        digest.update(taxonomy_bytes)
+        taxonomy = json.loads(taxonomy_bytes.decode('utf-8'))
+
+    key = digest.hexdigest()
+    if key not in _compiled:
+        _compiled[key] = Categorizer(raw, taxonomy, key)
+    return _compiled[key]
+
+
+if __name__ == '__main__':
+    from timeline_io import DEFAULT_DATA_PATH, load_dataset
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATA_PATH
+    categories = load_categorizer().classify_batch(load_dataset(file_path)['career_timelines'])
+    for career_key, category in categories.items():
+        print(f"{career_key}: {category}")
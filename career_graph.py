@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Career transition graph index.
+
+Compiles a career timeline dataset into a persisted adjacency index: one node per
+stage (main_path and pivot stages), CSR-style edge arrays, and per-edge weights
+for years spent and salary delta. Queries such as "fastest route to an exec role
+from stage X" or "top-k salary paths within N years" run against the compiled
+arrays, with per-source shortest-path results cached.
+"""
+
+import argparse
+import base64
+import hashlib
+import heapq
+import json
+import math
+import os
+import sys
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+from timeline_columns import LEVEL_CODES, LEVELS, MAIN_PATH, TimelineColumns
+from timeline_io import DEFAULT_DATA_PATH, load_dataset
+from timeline_stream import is_ndjson, ndjson_header_path
+
+INDEX_VERSION = 1
+
+NODE_COLUMNS = ('career_id', 'path_id', 'stage_index', 'level_code', 'cumulative_years', 'salary_mid')
+EDGE_COLUMNS = ('offsets', 'targets', 'edge_years', 'edge_salary')
+
+
+def default_index_path(file_path: str) -> str:
+    """Index location for a dataset file."""
+    root, _ = os.path.splitext(file_path)
+    return root + '.graph.json'
+
+
+def file_digest(file_path: str) -> str:
+    """Digest of a dataset file, including the header file of an NDJSON dataset."""
+    digest = hashlib.sha256()
+    paths = [file_path]
+    if is_ndjson(file_path) and os.path.exists(ndjson_header_path(file_path)):
+        paths.append(ndjson_header_path(file_path))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class CareerGraph:
+    """Stage-level transition graph stored as flat arrays."""
+
+    def __init__(self, career_keys: List[str], titles: List[str], arrays: Dict[str, array], source_digest: str = ''):
+        self.career_keys = career_keys
+        self.titles = titles
+        self.source_digest = source_digest
+        for name in NODE_COLUMNS + EDGE_COLUMNS:
+            setattr(self, name, arrays[name])
+        self._node_ids = {
+            (career_keys[c], p, s): node
+            for node, (c, p, s) in enumerate(zip(self.career_id, self.path_id, self.stage_index))
+        }
+        self.shortest_paths = lru_cache(maxsize=4096)(self._shortest_paths)
+
+    def __len__(self) -> int:
+        return len(self.career_id)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    @classmethod
+    def from_timelines(cls, career_timelines: Dict[str, Any], source_digest: str = '') -> 'CareerGraph':
+        """Compile a career_timelines mapping into the graph index."""
+        table = TimelineColumns.from_timelines(career_timelines)
+        salary_mid = table.salary_midpoints()
+        titles = []
+        adjacency: List[List[int]] = [[] for _ in range(len(table))]
+
+        node = 0
+        for career_data in career_timelines.values():
+            main_path = career_data.get('main_path', [])
+            main_start = node
+            for i, stage in enumerate(main_path):
+                titles.append(stage.get('title', ''))
+                if i + 1 < len(main_path):
+                    adjacency[node].append(node + 1)
+                node += 1
+            for pivot in career_data.get('pivot_opportunities', []):
+                stages = pivot.get('stages', [])
+                if stages and main_path:
+                    anchor = min(max(pivot.get('branchFromIndex', 0), 0), len(main_path) - 1)
+                    adjacency[main_start + anchor].append(node)
+                for i, stage in enumerate(stages):
+                    titles.append(stage.get('title', ''))
+                    if i + 1 < len(stages):
+                        adjacency[node].append(node + 1)
+                    node += 1
+
+        offsets = array('I', [0])
+        targets = array('I')
+        edge_years = array('d')
+        edge_salary = array('d')
+        years = table.cumulative_years
+        for src, dsts in enumerate(adjacency):
+            for dst in dsts:
+                targets.append(dst)
+                # Pivot stages can start "earlier" than their anchor; never go back in time
+                edge_years.append(max(0.0, years[dst] - years[src]))
+                delta = salary_mid[dst] - salary_mid[src]
+                edge_salary.append(0.0 if math.isnan(delta) else delta)
+            offsets.append(len(targets))
+
+        arrays = {
+            'career_id': table.career_id, 'path_id': table.path_id, 'stage_index': table.stage_index,
+            'level_code': table.level_code, 'cumulative_years': years, 'salary_mid': salary_mid,
+            'offsets': offsets, 'targets': targets, 'edge_years': edge_years, 'edge_salary': edge_salary
+        }
+        return cls(table.career_keys, titles, arrays, source_digest)
+
+    def save(self, index_path: str) -> None:
+        """Persist the index; arrays are stored as base64 of their raw buffers."""
+        payload = {
+            'version': INDEX_VERSION,
+            'source_digest': self.source_digest,
+            'byteorder': sys.byteorder,
+            'career_keys': self.career_keys,
+            'titles': self.titles,
+            'arrays': {
+                name: {'typecode': getattr(self, name).typecode,
+                       'data': base64.b64encode(getattr(self, name).tobytes()).decode('ascii')}
+                for name in NODE_COLUMNS + EDGE_COLUMNS
+            }
+        }
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, index_path: str) -> 'CareerGraph':
+        """Load a persisted index."""
+        with open(index_path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get('version') != INDEX_VERSION:
+            raise ValueError(f"{index_path}: unsupported graph index version {payload.get('version')}")
+        arrays = {}
+        for name, column in payload['arrays'].items():
+            values = array(column['typecode'])
+            values.frombytes(base64.b64decode(column['data']))
+            if payload['byteorder'] != sys.byteorder:
+                values.byteswap()
+            arrays[name] = values
+        return cls(payload['career_keys'], payload['titles'], arrays, payload['source_digest'])
+
+    def node_id(self, career_key: str, stage_index: int, path_id: int = MAIN_PATH) -> int:
+        """Node for a main_path stage (or a pivot stage when path_id is a pivot index)."""
+        try:
+            return self._node_ids[(career_key, path_id, stage_index)]
+        except KeyError:
+            if career_key not in self.career_keys:
+                raise KeyError(f"unknown career {career_key!r}") from None
+            path = 'main_path' if path_id == MAIN_PATH else f"pivot_opportunities[{path_id}]"
+            raise KeyError(f"no stage {stage_index} on {path} of {career_key!r}") from None
+
+    def describe(self, node: int) -> Dict[str, Any]:
+        """Readable view of a node."""
+        return {
+            'career': self.career_keys[self.career_id[node]],
+            'path': 'main_path' if self.path_id[node] == MAIN_PATH else f"pivot_opportunities[{self.path_id[node]}]",
+            'stage': self.stage_index[node],
+            'title': self.titles[node],
+            'level': LEVELS[self.level_code[node]] if self.level_code[node] >= 0 else None,
+            'cumulativeYears': self.cumulative_years[node],
+            'salaryMid': None if math.isnan(self.salary_mid[node]) else self.salary_mid[node]
+        }
+
+    def neighbours(self, node: int):
+        """(target, years, salary_delta) for each outgoing edge."""
+        for e in range(self.offsets[node], self.offsets[node + 1]):
+            yield self.targets[e], self.edge_years[e], self.edge_salary[e]
+
+    def _shortest_paths(self, source: int) -> Tuple[Dict[int, float], Dict[int, int]]:
+        """Dijkstra by years from source; cached per source node."""
+        dist = {source: 0.0}
+        prev: Dict[int, int] = {}
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for target, years, _ in self.neighbours(node):
+                nd = d + years
+                if nd < dist.get(target, math.inf):
+                    dist[target] = nd
+                    prev[target] = node
+                    heapq.heappush(heap, (nd, target))
+        return dist, prev
+
+    def fastest_to_level(self, source: int, level: str = 'exec') -> Optional[Tuple[float, List[int]]]:
+        """Fewest-years route from source to any stage at `level`, or None if unreachable."""
+        code = LEVEL_CODES[level]
+        dist, prev = self.shortest_paths(source)
+        reachable = [(d, node) for node, d in dist.items() if self.level_code[node] == code]
+        if not reachable:
+            return None
+        years, node = min(reachable)
+        path = [node]
+        while path[-1] != source:
+            path.append(prev[path[-1]])
+        return years, path[::-1]
+
+    def top_salary_paths(self, source: int, max_years: float, k: int = 5) -> List[Tuple[float, float, List[int]]]:
+        """The k routes from source ending at the highest salary within max_years.
+
+        Returns (salary_gain, years, path) tuples, best first. Routes are
+        enumerated depth-first; career subgraphs are small DAGs so this stays cheap.
+        """
+        best: List[Tuple[float, float, List[int]]] = []
+        stack = [(source, 0.0, 0.0, [source])]
+        while stack:
+            node, years, gain, path = stack.pop()
+            if node != source:
+                best.append((gain, -years, path))
+            for target, edge_years, edge_salary in self.neighbours(node):
+                if years + edge_years <= max_years and target not in path:
+                    stack.append((target, years + edge_years, gain + edge_salary, path + [target]))
+        return [(gain, -neg_years, path) for gain, neg_years, path in heapq.nlargest(k, best)]
+
+
+def build_index(file_path: str, index_path: Optional[str] = None) -> CareerGraph:
+    """Compile a dataset file into a graph index and persist it."""
+    data = load_dataset(file_path)
+    graph = CareerGraph.from_timelines(data.get('career_timelines', {}), file_digest(file_path))
+    graph.save(index_path or default_index_path(file_path))
+    return graph
+
+
+def load_or_build(file_path: str, index_path: Optional[str] = None) -> CareerGraph:
+    """Load the persisted index, rebuilding it if the dataset changed since it was built."""
+    index_path = index_path or default_index_path(file_path)
+    if os.path.exists(index_path):
+        graph = CareerGraph.load(index_path)
+        if graph.source_digest == file_digest(file_path):
+            return graph
+    return build_index(file_path, index_path)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Build the graph index or run a path query against it."""
+    parser = argparse.ArgumentParser(description='Career transition graph index.')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help='career timeline JSON or NDJSON file')
+    parser.add_argument('--index', help='graph index path (default: <data>.graph.json)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help='compile the dataset into the graph index')
+    fastest = sub.add_parser('fastest', help='fastest route to a level from a main_path stage')
+    fastest.add_argument('career')
+    fastest.add_argument('stage', type=int)
+    fastest.add_argument('--level', default='exec', choices=LEVELS)
+    top = sub.add_parser('top', help='top-k salary paths within a year budget from a main_path stage')
+    top.add_argument('career')
+    top.add_argument('stage', type=int)
+    top.add_argument('--years', type=float, default=5)
+    top.add_argument('-k', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        graph = build_index(args.data, args.index)
+        print(f"Indexed {len(graph)} stages and {graph.edge_count} transitions "
+              f"across {len(graph.career_keys)} careers")
+        return
+
+    graph = load_or_build(args.data, args.index)
+    try:
+        source = graph.node_id(args.career, args.stage)
+    except KeyError as e:
+        parser.error(e.args[0])
+    if args.command == 'fastest':
+        result = graph.fastest_to_level(source, args.level)
+        if result is None:
+            print(f"No {args.level} stage reachable")
+            return
+        years, path = result
+        print(f"{years:g} years:")
+        for node in path:
+            print(f"  {json.dumps(graph.describe(node), ensure_ascii=False)}")
+    else:
+        for gain, years, path in graph.top_salary_paths(source, args.years, args.k):
+            route = ' -> '.join(graph.titles[node] for node in path)
+            print(f"+${gain / 1000:,.0f}k in {years:g} years: {route}")
+
+
+if __name__ == '__main__':
+    main()
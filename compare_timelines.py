@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Batch analyzer for career timeline dataset variants.
+
+Parses and profiles N timeline files in parallel, then reports a per-career
+structural diff of every variant against a base file: careers and pivots added
+or removed, branchFromIndex shifts, and salary / cumulativeYears changes.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+
+from timeline_io import load_dataset
+
+StageProfile = List[Dict[str, Any]]
+
+
+def profile_stages(stages: List[Dict[str, Any]]) -> StageProfile:
+    """Keep only the stage fields the diff looks at."""
+    return [
+        {'title': stage.get('title'), 'cumulativeYears': stage.get('cumulativeYears'), 'salary': stage.get('salary')}
+        for stage in stages
+    ]
+
+
+def profile_career(career_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact structural profile of one career."""
+    pivots = {}
+    for pivot in career_data.get('pivot_opportunities', []):
+        name = pivot.get('branchName', '')
+        key, n = name, 2
+        while key in pivots:  # the same branch name can appear twice in one career
+            key, n = f"{name}#{n}", n + 1
+        pivots[key] = {
+            'branchFromIndex': pivot.get('branchFromIndex', 0),
+            'stages': profile_stages(pivot.get('stages', []))
+        }
+    return {
+        'name': career_data.get('name'),
+        'main_path': profile_stages(career_data.get('main_path', [])),
+        'pivots': pivots
+    }
+
+
+def analyze_dataset(file_path: str) -> Dict[str, Any]:
+    """Load one dataset and profile every career. Runs inside a worker process."""
+    data = load_dataset(file_path)
+    careers = data.get('career_timelines', {})
+    return {
+        'file': file_path,
+        'version': data.get('metadata', {}).get('version'),
+        'careers': {key: profile_career(career_data) for key, career_data in careers.items()}
+    }
+
+
+def diff_stages(path: str, old: StageProfile, new: StageProfile) -> List[Dict[str, Any]]:
+    """Changes between two stage lists, compared position by position."""
+    changes = []
+    for i, (a, b) in enumerate(zip(old, new)):
+        for field, change_type in (('salary', 'salary_changed'), ('cumulativeYears', 'years_changed'),
+                                   ('title', 'title_changed')):
+            if a[field] != b[field]:
+                changes.append({'type': change_type, 'path': f"{path}[{i}]", 'from': a[field], 'to': b[field]})
+    for i in range(len(new), len(old)):
+        changes.append({'type': 'stage_removed', 'path': f"{path}[{i}]", 'from': old[i]['title'], 'to': None})
+    for i in range(len(old), len(new)):
+        changes.append({'type': 'stage_added', 'path': f"{path}[{i}]", 'from': None, 'to': new[i]['title']})
+    return changes
+
+
+def diff_career(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Structural changes between two profiles of the same career."""
+    changes = diff_stages('main_path', old['main_path'], new['main_path'])
+    for name, pivot in old['pivots'].items():
+        if name not in new['pivots']:
+            changes.append({'type': 'pivot_removed', 'path': f"pivot:{name}",
+                            'from': pivot['branchFromIndex'], 'to': None})
+    for name, pivot in new['pivots'].items():
+        before = old['pivots'].get(name)
+        if before is None:
+            changes.append({'type': 'pivot_added', 'path': f"pivot:{name}",
+                            'from': None, 'to': pivot['branchFromIndex']})
+            continue
+        if before['branchFromIndex'] != pivot['branchFromIndex']:
+            changes.append({'type': 'branch_shift', 'path': f"pivot:{name}",
+                            'from': before['branchFromIndex'], 'to': pivot['branchFromIndex']})
+        changes.extend(diff_stages(f"pivot:{name}", before['stages'], pivot['stages']))
+    return changes
+
+
+def diff_datasets(base: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-career diff of `other` against `base`. Runs inside a worker process."""
+    base_careers, other_careers = base['careers'], other['careers']
+    careers = {}
+    for key in base_careers.keys() - other_careers.keys():
+        careers[key] = [{'type': 'career_removed', 'path': '', 'from': key, 'to': None}]
+    for key, profile in other_careers.items():
+        if key not in base_careers:
+            careers[key] = [{'type': 'career_added', 'path': '', 'from': None, 'to': key}]
+            continue
+        changes = diff_career(base_careers[key], profile)
+        if changes:
+            careers[key] = changes
+    return {'base': base['file'], 'variant': other['file'], 'careers': dict(sorted(careers.items()))}
+
+
+def compare_files(file_paths: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Profile every file in parallel and diff each variant against the first one."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        profiles = list(pool.map(analyze_dataset, file_paths))
+        base, variants = profiles[0], profiles[1:]
+        return list(pool.map(diff_datasets, [base] * len(variants), variants))
+
+
+def print_summary(diffs: List[Dict[str, Any]], out=sys.stdout) -> None:
+    """Human-readable summary of the diffs."""
+    for diff in diffs:
+        print(f"=== {os.path.basename(diff['variant'])} vs {os.path.basename(diff['base'])} ===", file=out)
+        print(f"Careers changed: {len(diff['careers'])}", file=out)
+        for key, changes in diff['careers'].items():
+            counts = {}
+            for change in changes:
+                counts[change['type']] = counts.get(change['type'], 0) + 1
+            summary = ', '.join(f"{change_type}: {n}" for change_type, n in sorted(counts.items()))
+            print(f"  {key}: {summary}", file=out)
+        print(file=out)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Compare the given dataset files and print or write the diff report."""
+    parser = argparse.ArgumentParser(description='Structural diff of career timeline dataset variants.')
+    parser.add_argument('files', nargs='+', help='dataset files; the first one is the base')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--json', metavar='PATH', help="write the full diff report as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    if len(args.files) < 2:
+        parser.error('need a base file and at least one variant')
+
+    diffs = compare_files(args.files, args.workers)
+
+    if args.json == '-':
+        json.dump(diffs, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(diffs, f, indent=2, ensure_ascii=False)
+    print_summary(diffs)
+
+
+if __name__ == '__main__':
+    main()
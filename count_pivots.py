@@ -1,55 +1,122 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import sys
 
+from instrumentation import add_profile_argument, profiler
+from timeline_io import DEFAULT_DATA_PATH, load_dataset
+from timeline_stream import is_ndjson
+
+def summarize_pivots(career_data):
+    """Pivot count and branchFromIndex distribution for a single career"""
+    pivot_ops = career_data.get('pivot_opportunities', [])
+    pivot_count = len(pivot_ops)
+
+    # Get branchFromIndex distribution
+    branch_distribution = {}
+    for op in pivot_ops:
+        idx = op.get('branchFromIndex', 0)
+        branch_distribution[idx] = branch_distribution.get(idx, 0) + 1
+
+    return {
+        'total_pivots': pivot_count,
+        'branch_distribution': branch_distribution,
+        'needs_enhancement': pivot_count < 3
+    }
+
+def print_report(pivot_counts, careers_needing_enhancement, out=sys.stdout):
+    """Print the pivot analysis summary"""
+    print("=== PIVOT OPPORTUNITIES ANALYSIS ===", file=out)
+    print(f"Total careers: {len(pivot_counts)}", file=out)
+    print(f"Careers needing enhancement: {len(careers_needing_enhancement)}", file=out)
+    print(file=out)
+
+    print("=== CAREERS NEEDING ENHANCEMENT ===", file=out)
+    for career in careers_needing_enhancement:
+        info = pivot_counts[career]
+        print(f"{career}: {info['total_pivots']} pivots, branches: {info['branch_distribution']}", file=out)
+
+    print(file=out)
+    print("=== ALL CAREER PIVOT COUNTS ===", file=out)
+    for career, info in sorted(pivot_counts.items()):
+        status = "NEEDS ENHANCEMENT" if info['needs_enhancement'] else "OK"
+        print(f"{career}: {info['total_pivots']} pivots, branches: {info['branch_distribution']} [{status}]", file=out)
+
 def count_pivots_per_career(file_path):
     """Count pivot opportunities for each career and identify those needing enhancement"""
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    careers = data.get('career_timelines', {})
+
+    with profiler.phase('load'):
+        data = load_dataset(file_path)
+
+    return count_pivots_in(data.get('career_timelines', {}))
+
+def count_pivots_in(careers, out=sys.stdout):
+    """Count and report pivot opportunities for an already loaded career_timelines mapping"""
     pivot_counts = {}
     careers_needing_enhancement = []
-    
+
     for career_name, career_data in careers.items():
-        pivot_ops = career_data.get('pivot_opportunities', [])
-        pivot_count = len(pivot_ops)
-        
-        # Get branchFromIndex distribution
-        branch_indices = [op.get('branchFromIndex', 0) for op in pivot_ops]
-        branch_distribution = {}
-        for idx in branch_indices:
-            branch_distribution[idx] = branch_distribution.get(idx, 0) + 1
-        
-        pivot_counts[career_name] = {
-            'total_pivots': pivot_count,
-            'branch_distribution': branch_distribution,
-            'needs_enhancement': pivot_count < 3
-        }
-        
-        if pivot_count < 3:
+        with profiler.career(career_name):
+            pivot_counts[career_name] = summarize_pivots(career_data)
+        if pivot_counts[career_name]['needs_enhancement']:
             careers_needing_enhancement.append(career_name)
-    
-    # Print summary
-    print("=== PIVOT OPPORTUNITIES ANALYSIS ===")
-    print(f"Total careers: {len(careers)}")
-    print(f"Careers needing enhancement: {len(careers_needing_enhancement)}")
-    print()
-    
-    print("=== CAREERS NEEDING ENHANCEMENT ===")
-    for career in careers_needing_enhancement:
-        info = pivot_counts[career]
-        print(f"{career}: {info['total_pivots']} pivots, branches: {info['branch_distribution']}")
-    
-    print()
-    print("=== ALL CAREER PIVOT COUNTS ===")
-    for career, info in sorted(pivot_counts.items()):
-        status = "NEEDS ENHANCEMENT" if info['needs_enhancement'] else "OK"
-        print(f"{career}: {info['total_pivots']} pivots, branches: {info['branch_distribution']} [{status}]")
-    
+
+    with profiler.phase('report'):
+        print_report(pivot_counts, careers_needing_enhancement, out)
+
+    return pivot_counts, careers_needing_enhancement
+
+def count_pivots_streaming(file_path, jsonl_out=None, report_out=sys.stdout):
+    """Count pivots while streaming the file one career at a time.
+
+    Only the small per-career summaries are kept for the final report, so memory
+    stays bounded by the largest career block. If jsonl_out is given, one JSON
+    record per career is written to it as soon as that career has been read.
+    """
+    from timeline_stream import iter_career_timelines
+
+    pivot_counts = {}
+    careers_needing_enhancement = []
+
+    for career_name, career_data in iter_career_timelines(file_path):
+        with profiler.career(career_name):
+            info = summarize_pivots(career_data)
+        pivot_counts[career_name] = info
+        if info['needs_enhancement']:
+            careers_needing_enhancement.append(career_name)
+        if jsonl_out is not None:
+            jsonl_out.write(json.dumps({'career': career_name, **info}) + '\n')
+
+    with profiler.phase('report'):
+        print_report(pivot_counts, careers_needing_enhancement, report_out)
+
     return pivot_counts, careers_needing_enhancement
 
+def run(args):
+    """Dispatch to the in-memory or streaming counter (NDJSON input is always streamed)"""
+    if args.stream or args.jsonl or is_ndjson(args.file_path):
+        if args.jsonl == '-':
+            # Keep stdout machine-readable; the human summary goes to stderr
+            count_pivots_streaming(args.file_path, sys.stdout, sys.stderr)
+        elif args.jsonl:
+            with open(args.jsonl, 'w', encoding='utf-8') as jsonl_out:
+                count_pivots_streaming(args.file_path, jsonl_out)
+        else:
+            count_pivots_streaming(args.file_path)
+    else:
+        count_pivots_per_career(args.file_path)
+
 if __name__ == "__main__":
-    file_path = sys.argv[1] if len(sys.argv) > 1 else "careerTimelineData_PhDOptimized.json"
-    pivot_counts, careers_needing_enhancement = count_pivots_per_career(file_path)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Count pivot opportunities per career.')
+    parser.add_argument('file_path', nargs='?', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--stream', action='store_true', help='walk career_timelines incrementally with bounded memory')
+    parser.add_argument('--jsonl', metavar='PATH', help="write per-career records as JSON lines ('-' for stdout); implies --stream")
+    add_profile_argument(parser, 'count_pivots')
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler.start('count_pivots')
+    try:
+        run(args)
+    finally:
+        profiler.finish(args.profile_report)
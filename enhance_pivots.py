@@ -4,248 +4,390 @@ Script to enhance pivot opportunities in PhD-optimized career dataset.
 This script adds more diverse pivot opportunities at different career stages.
 """
 
+import argparse
+import difflib
+import hashlib
 import json
+import os
 import sys
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from career_categorizer import Categorizer, load_categorizer
+from instrumentation import add_profile_argument, profiler
+from pivot_rules import PIVOT_RULES_PATH, BranchRule, PivotPlan, load_plan, plan_as_templates
+from salary_ranges import SalaryParseError, format_salary_range, parse_salary_range
+from snapshot_store import RunSnapshots, add_snapshot_argument
+from timeline_blocks import load_with_career_spans, dump_block, splice
+from timeline_io import DEFAULT_DATA_PATH, load_dataset, write_text
+from timeline_stream import is_ndjson
+from timeline_writer import FORMATS, format_for_path, stream_transform, write_dataset
+
+TEMPLATE_CATEGORIES = ('tech', 'science', 'business')
+CHANGELOG_ENTRY = 'Enhanced pivot opportunities: 3-4 pivots per career, senior/leadership level pivots added'
 
 def load_career_data(file_path: str) -> Dict[str, Any]:
     """Load the career timeline JSON data."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with profiler.phase('load'):
+        return load_dataset(file_path)
 
 def save_career_data(data: Dict[str, Any], file_path: str) -> None:
-    """Save the enhanced career timeline JSON data."""
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-def get_pivot_templates() -> Dict[str, List[Dict[str, Any]]]:
-    """Define pivot opportunity templates for different career types."""
-    
-    colors = ["#DC2626", "#7C3AED", "#F59E0B", "#059669"]  # red, purple, gold, teal
-    
-    # Templates for different types of careers
-    templates = {
-        # Tech/Engineering careers
-        'tech': [
-            {
-                'index': 1, 'name': 'Technical Leadership', 'color': colors[0], 'success': '85%',
-                'roles': [
-                    {'title': 'Tech Lead', 'short': 'Tech Lead', 'level': 'senior', 'years_offset': 0.5, 'salary': '+$20k-$40k'},
-                    {'title': 'Engineering Manager', 'short': 'Eng Mgr', 'level': 'lead', 'years_offset': 2.5, 'salary': '+$40k-$80k'},
-                    {'title': 'Director of Engineering', 'short': 'Eng Dir', 'level': 'exec', 'years_offset': 5, 'salary': '+$80k-$150k'}
-                ]
-            },
-            {
-                'index': 2, 'name': 'Product & Strategy', 'color': colors[1], 'success': '75%',
-                'roles': [
-                    {'title': 'Technical Product Manager', 'short': 'Tech PM', 'level': 'senior', 'years_offset': 0.5, 'salary': '+$10k-$30k'},
-                    {'title': 'Senior Product Manager', 'short': 'Sr PM', 'level': 'lead', 'years_offset': 3, 'salary': '+$30k-$60k'},
-                    {'title': 'VP Product', 'short': 'VP Product', 'level': 'exec', 'years_offset': 5, 'salary': '+$100k-$200k'}
-                ]
-            },
-            {
-                'index': 3, 'name': 'Executive Leadership', 'color': colors[2], 'success': '65%',
-                'roles': [
-                    {'title': 'VP of Engineering', 'short': 'VP Eng', 'level': 'exec', 'years_offset': 1, 'salary': '+$50k-$100k'},
-                    {'title': 'Chief Technology Officer', 'short': 'CTO', 'level': 'exec', 'years_offset': 3, 'salary': '+$100k-$250k'}
-                ]
-            },
-            {
-                'index': 2, 'name': 'Consulting & Advisory', 'color': colors[3], 'success': '70%',
-                'roles': [
-                    {'title': 'Principal Consultant', 'short': 'Principal', 'level': 'senior', 'years_offset': 0.5, 'salary': '+$20k-$50k'},
-                    {'title': 'Partner', 'short': 'Partner', 'level': 'exec', 'years_offset': 4, 'salary': '+$80k-$200k'}
-                ]
-            }
-        ],
-        
-        # Science/Research careers  
-        'science': [
-            {
-                'index': 1, 'name': 'Industry Research Leadership', 'color': colors[0], 'success': '80%',
-                'roles': [
-                    {'title': 'Senior Research Scientist', 'short': 'Sr Research', 'level': 'senior', 'years_offset': 0.5, 'salary': '+$15k-$35k'},
-                    {'title': 'Research Director', 'short': 'Research Dir', 'level': 'lead', 'years_offset': 3, 'salary': '+$50k-$100k'},
-                    {'title': 'Chief Scientific Officer', 'short': 'CSO', 'level': 'exec', 'years_offset': 6, 'salary': '+$100k-$200k'}
-                ]
-            },
-            {
-                'index': 2, 'name': 'Product & Commercialization', 'color': colors[1], 'success': '70%',
-                'roles': [
-                    {'title': 'Product Development Manager', 'short': 'Product Dev', 'level': 'senior', 'years_offset': 0.5, 'salary': '+$10k-$25k'},
-                    {'title': 'VP Product Development', 'short': 'VP Product', 'level': 'lead', 'years_offset': 3.5, 'salary': '+$40k-$80k'},
-                    {'title': 'Chief Product Officer', 'short': 'CPO', 'level': 'exec', 'years_offset': 6, 'salary': '+$80k-$150k'}
-                ]
-            },
-            {
-                'index': 3, 'name': 'Entrepreneurship', 'color': colors[2], 'success': '60%',
-                'roles': [
-                    {'title': 'Co-Founder/CTO', 'short': 'Co-Founder', 'level': 'exec', 'years_offset': 1, 'salary': 'Equity-based'},
-                    {'title': 'CEO/Founder', 'short': 'CEO', 'level': 'exec', 'years_offset': 3, 'salary': 'Equity + $150k-$300k'}
-                ]
-            },
-            {
-                'index': 1, 'name': 'Consulting & Advisory', 'color': colors[3], 'success': '75%',
-                'roles': [
-                    {'title': 'Scientific Consultant', 'short': 'Consultant', 'level': 'senior', 'years_offset': 0, 'salary': '+$20k-$40k'},
-                    {'title': 'Principal Consultant', 'short': 'Principal', 'level': 'lead', 'years_offset': 3, 'salary': '+$50k-$100k'},
-                    {'title': 'Partner', 'short': 'Partner', 'level': 'exec', 'years_offset': 6, 'salary': '+$100k-$250k'}
-                ]
-            }
-        ],
-        
-        # Business/Management careers
-        'business': [
-            {
-                'index': 1, 'name': 'Strategic Leadership', 'color': colors[0], 'success': '80%',
-                'roles': [
-                    {'title': 'Strategy Manager', 'short': 'Strategy Mgr', 'level': 'senior', 'years_offset': 0.5, 'salary': '+$15k-$30k'},
-                    {'title': 'Director of Strategy', 'short': 'Strategy Dir', 'level': 'lead', 'years_offset': 3, 'salary': '+$40k-$80k'},
-                    {'title': 'VP Strategy', 'short': 'VP Strategy', 'level': 'exec', 'years_offset': 6, 'salary': '+$80k-$150k'}
-                ]
-            },
-            {
-                'index': 2, 'name': 'Operations Leadership', 'color': colors[1], 'success': '75%',
-                'roles': [
-                    {'title': 'Operations Manager', 'short': 'Ops Mgr', 'level': 'senior', 'years_offset': 0.5, 'salary': '+$10k-$25k'},
-                    {'title': 'Director of Operations', 'short': 'Ops Dir', 'level': 'lead', 'years_offset': 3, 'salary': '+$30k-$60k'},
-                    {'title': 'Chief Operating Officer', 'short': 'COO', 'level': 'exec', 'years_offset': 6, 'salary': '+$100k-$200k'}
-                ]
-            },
-            {
-                'index': 3, 'name': 'Executive Leadership', 'color': colors[2], 'success': '65%',
-                'roles': [
-                    {'title': 'VP Business Development', 'short': 'VP BizDev', 'level': 'exec', 'years_offset': 1, 'salary': '+$50k-$100k'},
-                    {'title': 'Chief Executive Officer', 'short': 'CEO', 'level': 'exec', 'years_offset': 4, 'salary': '+$150k-$400k'}
-                ]
-            },
-            {
-                'index': 2, 'name': 'Investment & Finance', 'color': colors[3], 'success': '70%',
-                'roles': [
-                    {'title': 'Investment Manager', 'short': 'Investment', 'level': 'senior', 'years_offset': 0.5, 'salary': '+$20k-$50k'},
-                    {'title': 'Principal/Partner', 'short': 'Partner', 'level': 'exec', 'years_offset': 4, 'salary': '+$100k-$300k'}
-                ]
-            }
-        ]
-    }
-    
-    return templates
-
-def categorize_career(career_name: str, career_data: Dict[str, Any]) -> str:
-    """Categorize a career into tech, science, or business based on name and industries."""
-    name_lower = career_name.lower()
-    industries = [ind.lower() for ind in career_data.get('targetIndustries', [])]
-    
-    # Tech keywords
-    tech_keywords = ['engineer', 'developer', 'devops', 'software', 'ai', 'ml', 'data scientist', 'cybersecurity']
-    if any(keyword in name_lower for keyword in tech_keywords):
-        return 'tech'
-    
-    # Science keywords  
-    science_keywords = ['scientist', 'research', 'bioinformatics', 'biostatistician', 'clinical', 'medical']
-    if any(keyword in name_lower for keyword in science_keywords):
-        return 'science'
-        
-    # Business default for others
-    return 'business'
-
-def create_pivot_opportunity(template: Dict[str, Any], base_stages: List[Dict[str, Any]], branch_index: int) -> Dict[str, Any]:
-    """Create a pivot opportunity from a template."""
+    """Save the enhanced career timeline data in the layout its file name implies (NDJSON for .ndjson/.jsonl)."""
+    with profiler.phase('write'):
+        write_dataset(data, file_path)
+
+def get_pivot_templates(rules_path: str = PIVOT_RULES_PATH) -> Dict[str, List[Dict[str, Any]]]:
+    """Pivot opportunity templates for different career types, as defined in pivot_rules.json."""
+    return plan_as_templates(load_plan(rules_path))
+
+def template_category(category: str) -> str:
+    """The pivot template category for a categorizer result."""
+    # Careers with no category signal ("general") get the business templates
+    return category if category in TEMPLATE_CATEGORIES else 'business'
+
+def categorize_career(career_name: str, career_data: Dict[str, Any], career_key: str,
+                      categorizer: Optional[Categorizer] = None) -> str:
+    """Categorize a career into tech, science, or business using the shared category rules.
+
+    career_key is required: key overrides and taxonomy signals depend on it, and
+    without them a career can be categorized differently than by restore_pivots.
+    """
+    return template_category((categorizer or load_categorizer()).classify(career_key, career_data, career_name))
+
+def create_pivot_opportunity(template: BranchRule, base_stages: List[Dict[str, Any]], branch_index: int,
+                             career_name: str = 'career') -> Dict[str, Any]:
+    """Create a pivot opportunity from a compiled branch rule; career_name is used in warnings."""
     if branch_index >= len(base_stages):
+        print(f"Warning: branchFromIndex {branch_index} is past the end of main_path, "
+              f"branching from stage {len(base_stages) - 1} instead")
         branch_index = len(base_stages) - 1
-        
+
     base_stage = base_stages[branch_index]
-    
+
     pivot = {
         'branchFromIndex': branch_index,
-        'branchName': template['name'],
-        'color': template['color'],
-        'transitionSuccess': template['success'],
+        'branchName': template.name,
+        'color': template.color,
+        'transitionSuccess': template.success,
         'stages': []
     }
-    
-    for i, role_template in enumerate(template['roles']):
+
+    # Years after the anchor stage at which each role starts; timeToNext is the gap to the next role
+    starts = [role.years_offset + i * 2 for i, role in enumerate(template.roles)]
+    for i, role in enumerate(template.roles):
         stage = {
-            'title': role_template['title'],
-            'shortTitle': role_template['short'],
-            'level': role_template['level'],
-            'cumulativeYears': base_stage['cumulativeYears'] + role_template['years_offset'] + (i * 2),
-            'timeToNext': 3 if i < len(template['roles']) - 1 else None,
+            'title': role.title,
+            'shortTitle': role.short_title,
+            'level': role.level,
+            'cumulativeYears': base_stage['cumulativeYears'] + starts[i],
+            'timeToNext': starts[i + 1] - starts[i] if i + 1 < len(starts) else None,
             'remoteFriendly': base_stage.get('remoteFriendly', True)
         }
-        
-        # Calculate salary based on base stage and offset
-        if 'salary' in base_stage and role_template['salary'] != 'Equity-based' and not role_template['salary'].startswith('Equity'):
-            try:
-                base_min, base_max = [int(x.replace('$', '').replace('k', '000')) for x in base_stage['salary'].split('-')]
-                if '+' in role_template['salary']:
-                    offset_str = role_template['salary'].replace('+$', '').replace('+', '')
-                    offset_min, offset_max = [int(x.replace('k', '000')) for x in offset_str.split('-')]
-                    new_min = base_min + offset_min
-                    new_max = base_max + offset_max
-                    stage['salary'] = f"${new_min//1000}k-${new_max//1000}k"
-                else:
-                    stage['salary'] = role_template['salary']
-            except:
-                stage['salary'] = role_template['salary']
+
+        # Offset salaries are relative to the anchor stage; without a usable anchor salary
+        # the stage is left without one rather than given the offset text
+        if role.salary_offset is None:
+            stage['salary'] = role.salary_text
+        elif 'salary' not in base_stage:
+            print(f"Warning: {career_name}: no salary for {role.title}, "
+                  f"main_path stage {branch_index} has no salary")
         else:
-            stage['salary'] = role_template['salary']
-        
+            try:
+                base_min, base_max, _ = parse_salary_range(base_stage['salary'])
+            except SalaryParseError as e:
+                print(f"Warning: {career_name}: no salary for {role.title}: {e}")
+            else:
+                stage['salary'] = format_salary_range(base_min + role.salary_offset[0],
+                                                      base_max + role.salary_offset[1])
+
         pivot['stages'].append(stage)
-    
+
     return pivot
 
-def enhance_career_pivots(career_data: Dict[str, Any], career_name: str) -> Dict[str, Any]:
-    """Enhance pivot opportunities for a single career."""
-    career_type = categorize_career(career_name, career_data)
-    templates = get_pivot_templates()[career_type]
-    
+def build_career_pivots(career_data: Dict[str, Any], career_name: str, plan: PivotPlan,
+                        career_type: str) -> List[Dict[str, Any]]:
+    """Build the pivot opportunities for a single, already categorized career from a compiled plan."""
     # Get main path stages
     main_stages = career_data.get('main_path', [])
     if len(main_stages) < 3:
         print(f"Warning: {career_name} has less than 3 main stages, using available stages")
-    
+
     # Create 3-4 pivot opportunities
-    new_pivots = []
-    for i, template in enumerate(templates[:4]):  # Limit to 4 pivots max
-        pivot = create_pivot_opportunity(template, main_stages, template['index'])
-        new_pivots.append(pivot)
-    
-    career_data['pivot_opportunities'] = new_pivots
+    with profiler.phase('template apply'):
+        pivots = []
+        for template in plan.categories[career_type][:4]:  # Limit to 4 pivots max
+            with profiler.phase('create pivot'):
+                pivots.append(create_pivot_opportunity(template, main_stages, template.index, career_name))
+        return pivots
+
+def enhance_career_pivots(career_data: Dict[str, Any], career_name: str, career_key: str,
+                          plan: Optional[PivotPlan] = None) -> Dict[str, Any]:
+    """Enhance pivot opportunities for a single career, categorized exactly as in a full run."""
+    with profiler.phase('categorize'):
+        career_type = categorize_career(career_name, career_data, career_key)
+    career_data['pivot_opportunities'] = build_career_pivots(career_data, career_name, plan or load_plan(), career_type)
     return career_data
 
-def main():
+def apply_plan(careers: Dict[str, Any], plan: PivotPlan, keys: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Compute new pivot opportunities for the given careers (all by default) in one pass."""
+    selected = careers if keys is None else {key: careers[key] for key in keys}
+    with profiler.phase('categorize'):
+        categories = load_categorizer().classify_batch(selected)
+    new_pivots = {}
+    for key in selected:
+        with profiler.career(key):
+            new_pivots[key] = build_career_pivots(careers[key], careers[key].get('name', key), plan,
+                                                  template_category(categories[key]))
+    return new_pivots
+
+def install_pivots(data: Dict[str, Any], new_pivots: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Replace the pivots of the given careers and record the enhancement in the metadata."""
+    careers = data['career_timelines']
+    for career_key, pivots in new_pivots.items():
+        print(f"Enhancing {careers[career_key].get('name', career_key)}...")
+        careers[career_key]['pivot_opportunities'] = pivots
+
+    print(f"Enhanced {len(new_pivots)} careers")
+    record_enhancement(data['metadata'])
+
+def record_enhancement(metadata: Dict[str, Any]) -> None:
+    """Update the metadata block for an enhancement run."""
+    metadata['lastUpdated'] = '2025-08-31'
+    # Re-running an enhancement is not a new change, so the entry is only added once
+    if CHANGELOG_ENTRY not in metadata['changeLog']:
+        metadata['changeLog'].append(CHANGELOG_ENTRY)
+
+def print_pivot_totals(careers: Dict[str, Any]) -> None:
+    """Print summary statistics of the pivot opportunities."""
+    print_totals(sum(len(career['pivot_opportunities']) for career in careers.values()), len(careers))
+
+def print_totals(total_pivots: int, career_count: int) -> None:
+    print(f"Total pivot opportunities: {total_pivots}")
+    print(f"Average pivots per career: {total_pivots / career_count:.1f}")
+
+def enhance_streaming(file_path: str, output_path: str, plan: PivotPlan, fmt: Optional[str] = None,
+                      snapshots: Optional[RunSnapshots] = None) -> None:
+    """Regenerate every career's pivots while streaming file_path into output_path.
+
+    Careers are read, enhanced and written one at a time (see timeline_writer.py
+    for the output formats), so memory stays bounded by a single career.
+    """
+    categorizer = load_categorizer()
+    total_pivots = 0
+
+    def transform(career_key: str, career_data: Dict[str, Any]) -> Dict[str, Any]:
+        nonlocal total_pivots
+        career_name = career_data.get('name', career_key)
+        print(f"Enhancing {career_name}...")
+        with profiler.career(career_key):
+            with profiler.phase('categorize'):
+                career_type = categorize_career(career_name, career_data, career_key, categorizer)
+            career_data['pivot_opportunities'] = build_career_pivots(career_data, career_name, plan, career_type)
+        total_pivots += len(career_data['pivot_opportunities'])
+        return career_data
+
+    def update_member(key: str, value: Any) -> Any:
+        if key == 'metadata':
+            record_enhancement(value)
+        return value
+
+    if snapshots:
+        snapshots.before(file_path)
+    career_count = stream_transform(file_path, output_path, transform, fmt, update_member)
+    if snapshots:
+        snapshots.after_file(output_path)
+    print(f"Enhanced {career_count} careers")
+    print("Enhancement complete!")
+    if career_count:
+        print_totals(total_pivots, career_count)
+
+def pivot_diff(career_key: str, old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> str:
+    """Unified diff between a career's current and regenerated pivot opportunities."""
+    return ''.join(difflib.unified_diff(
+        dump_block(old, 0).splitlines(keepends=True),
+        dump_block(new, 0).splitlines(keepends=True),
+        fromfile=f"{career_key}/pivot_opportunities (current)",
+        tofile=f"{career_key}/pivot_opportunities (enhanced)"
+    ))
+
+def print_dry_run(careers: Dict[str, Any], new_pivots: Dict[str, List[Dict[str, Any]]]) -> int:
+    """Print the pivot diff for every career that would change; return how many would."""
+    changed = 0
+    for key, pivots in new_pivots.items():
+        diff = pivot_diff(key, careers[key].get('pivot_opportunities', []), pivots)
+        if diff:
+            print(diff, end='' if diff.endswith('\n') else '\n')
+            changed += 1
+    return changed
+
+def json_digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def career_input_hash(career_data: Dict[str, Any], version: str) -> str:
+    """Hash every input that pivot generation depends on for a single career."""
+    return json_digest({
+        'name': career_data.get('name'),
+        'main_path': career_data.get('main_path', []),
+        'targetIndustries': career_data.get('targetIndustries', []),
+        'template_version': version
+    })
+
+def manifest_entry(career_data: Dict[str, Any], version: str) -> Dict[str, str]:
+    """Manifest record of a career: its generation inputs and the pivots it currently holds.
+
+    Hashing the pivots too means pivots edited or removed after the last run
+    are regenerated, just as a full run would.
+    """
+    return {
+        'inputs': career_input_hash(career_data, version),
+        'pivots': json_digest(career_data.get('pivot_opportunities'))
+    }
+
+def default_manifest_path(file_path: str) -> str:
+    """Sidecar manifest location for a dataset file."""
+    root, _ = os.path.splitext(file_path)
+    return root + '.pivot-manifest.json'
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """Load the pivot manifest, or an empty one if it does not exist yet."""
+    if not os.path.exists(manifest_path):
+        return {'template_version': None, 'careers': {}}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(manifest: Dict[str, Any], manifest_path: str) -> None:
+    """Save the pivot manifest."""
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def enhance_incremental(file_path: str, manifest_path: Optional[str] = None,
+                        plan: Optional[PivotPlan] = None, dry_run: bool = False,
+                        snapshots: Optional[RunSnapshots] = None) -> List[str]:
+    """Regenerate pivots only for careers whose inputs or pivots changed since the last run.
+
+    Unchanged career blocks are copied verbatim from the existing file; only the
+    changed blocks and the metadata block are re-serialized. Returns the keys of
+    the careers that were regenerated. With dry_run, prints the pivot diffs and
+    leaves both the dataset and the manifest untouched. If snapshots is given,
+    the dataset is recorded before and after a run that changes it.
+    """
+    plan = plan or load_plan()
+    manifest_path = manifest_path or default_manifest_path(file_path)
+    with profiler.phase('load'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        data, top_spans, career_spans = load_with_career_spans(text)
+    careers = data['career_timelines']
+    manifest = load_manifest(manifest_path)
+    # Category rule changes re-categorize careers, so they invalidate the manifest too
+    version = f"{plan.template_version}+{load_categorizer().rules_version}"
+    previous = manifest['careers'] if manifest.get('template_version') == version else {}
+
+    entries = {key: manifest_entry(career_data, version) for key, career_data in careers.items()}
+    changed = [key for key, entry in entries.items() if previous.get(key) != entry]
+    new_pivots = apply_plan(careers, plan, changed)
+
+    if dry_run:
+        print_dry_run(careers, new_pivots)
+        return changed
+
+    replacements = []
+    for career_key, pivots in new_pivots.items():
+        print(f"Enhancing {careers[career_key].get('name', career_key)}...")
+        careers[career_key]['pivot_opportunities'] = pivots
+        entries[career_key] = manifest_entry(careers[career_key], version)
+        with profiler.phase('serialize'):
+            replacements.append((career_spans[career_key], dump_block(careers[career_key], 2)))
+
+    if changed:
+        record_enhancement(data['metadata'])
+        with profiler.phase('serialize'):
+            replacements.append((top_spans['metadata'], dump_block(data['metadata'], 1)))
+            text = splice(text, replacements)
+        if snapshots:
+            snapshots.before(file_path)
+        with profiler.phase('write'):
+            write_text(text, file_path)
+        if snapshots:
+            snapshots.after(data, file_path)
+
+    save_manifest({'template_version': version, 'careers': entries}, manifest_path)
+    return changed
+
+def main(argv: Optional[List[str]] = None):
     """Main function to enhance all career pivot opportunities."""
-    file_path = 'C:/Users/virga/documents/Github/IndustryCareerGuide/data/careerTimelineData_PhDOptimized.json'
-    
+    parser = argparse.ArgumentParser(description='Enhance pivot opportunities in a career timeline dataset.')
+    parser.add_argument('file_path', nargs='?', default=DEFAULT_DATA_PATH, help='career timeline JSON file')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only regenerate careers whose inputs or pivots changed since the last run')
+    parser.add_argument('--manifest', help='sidecar manifest path (default: <file>.pivot-manifest.json)')
+    parser.add_argument('--rules', default=PIVOT_RULES_PATH, help='pivot rule file (default: pivot_rules.json)')
+    parser.add_argument('--dry-run', action='store_true', help='print a diff of the pivot changes without writing')
+    parser.add_argument('-o', '--output',
+                        help='stream the enhanced dataset here (snapshots are only recorded if this is file_path)')
+    parser.add_argument('--format', choices=FORMATS,
+                        help='stream the output in this format (default: ndjson for .ndjson/.jsonl, else pretty)')
+    add_profile_argument(parser, 'enhance_pivots')
+    add_snapshot_argument(parser)
+    args = parser.parse_args(argv)
+    if (args.output or args.format) and (args.incremental or args.dry_run):
+        parser.error('--output/--format cannot be combined with --incremental or --dry-run')
+    if args.incremental and is_ndjson(args.file_path):
+        # Incremental runs splice career blocks inside a single JSON document
+        parser.error('--incremental needs a JSON dataset, not NDJSON')
+    if args.output or args.format:
+        try:
+            format_for_path(args.output or args.file_path, args.format)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.profile:
+        profiler.start('enhance_pivots')
+    try:
+        run(args)
+    finally:
+        profiler.finish(args.profile_report)
+
+def run(args: argparse.Namespace) -> None:
+    """Run the enhancement selected by the parsed command line."""
+    file_path = args.file_path
+    plan = load_plan(args.rules)
+    enabled = not (args.no_snapshot or args.dry_run)
+    snapshots = RunSnapshots('enhance_pivots', file_path, enabled=enabled)
+
+    if args.incremental:
+        print("Enhancing changed careers...")
+        changed = enhance_incremental(file_path, args.manifest, plan, args.dry_run, snapshots)
+        print(f"{'Would enhance' if args.dry_run else 'Enhanced'} {len(changed)} changed careers")
+        return
+
+    if args.output or args.format:
+        print("Streaming enhanced careers...")
+        output = args.output or file_path
+        enhance_streaming(file_path, output, plan, args.format,
+                          RunSnapshots.for_output('enhance_pivots', file_path, output, enabled))
+        return
+
     print("Loading career data...")
     data = load_career_data(file_path)
-    
+    careers = data['career_timelines']
+
     print("Enhancing pivot opportunities...")
-    enhanced_careers = 0
-    
-    for career_key, career_data in data['career_timelines'].items():
-        career_name = career_data.get('name', career_key)
-        print(f"Enhancing {career_name}...")
-        
-        data['career_timelines'][career_key] = enhance_career_pivots(career_data, career_name)
-        enhanced_careers += 1
-    
-    print(f"Enhanced {enhanced_careers} careers")
-    
-    # Update metadata
-    data['metadata']['lastUpdated'] = '2025-08-31'
-    data['metadata']['changeLog'].append('Enhanced pivot opportunities: 3-4 pivots per career, senior/leadership level pivots added')
-    
+    new_pivots = apply_plan(careers, plan)
+
+    if args.dry_run:
+        changed = print_dry_run(careers, new_pivots)
+        print(f"Would change pivot opportunities for {changed} of {len(careers)} careers")
+        return
+
+    install_pivots(data, new_pivots)
+
     print("Saving enhanced data...")
+    snapshots.before(file_path)
     save_career_data(data, file_path)
-    
+    snapshots.after(data, file_path)
+
     print("Enhancement complete!")
-    
-    # Print summary statistics
-    total_pivots = sum(len(career['pivot_opportunities']) for career in data['career_timelines'].values())
-    print(f"Total pivot opportunities: {total_pivots}")
-    print(f"Average pivots per career: {total_pivots / len(data['career_timelines']):.1f}")
+    print_pivot_totals(careers)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
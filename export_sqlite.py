@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Compile every data/*.json dataset into one indexed SQLite database.
+
+Careers, stages, pivots, skills and PhD domain bonuses get their own indexed
+tables so a route can look up a single career without deserializing whole
+files. Each row keeps its original JSON alongside the extracted columns, and
+`--verify` rebuilds every source document from the database and compares it
+with the JSON on disk.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+from typing import Dict, List, Any, Optional, Tuple
+
+from salary_ranges import SalaryParseError, parse_salary_range
+from timeline_io import DATA_DIR
+
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, 'careers.sqlite')
+
+# Artifacts other tools write next to the datasets: graph indexes (career_graph.py),
+# pivot manifests (enhance_pivots.py), NDJSON headers (timeline_writer.py) and the
+# skill-gap matrix (skill_gaps.py)
+GENERATED_SUFFIXES = ('.graph.json', '.pivot-manifest.json', '.header.json')
+GENERATED_FILES = ('skillGapMatrix.json',)
+
+# Top-level members that hold careers, and the per-career members stored in child tables
+CAREER_CONTAINERS = ('career_timelines', 'trajectories', 'career_paths')
+STAGE_LISTS = ('main_path', 'stages')
+CHILD_LISTS = STAGE_LISTS + ('pivot_opportunities',)
+
+SCHEMA = """
+CREATE TABLE datasets (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL UNIQUE,
+    container TEXT,
+    container_is_list INTEGER NOT NULL DEFAULT 0,
+    residual_json TEXT NOT NULL
+);
+CREATE TABLE careers (
+    id INTEGER PRIMARY KEY,
+    dataset_id INTEGER NOT NULL REFERENCES datasets(id),
+    position INTEGER NOT NULL,
+    career_key TEXT NOT NULL,
+    name TEXT,
+    category TEXT,
+    body_json TEXT NOT NULL
+);
+CREATE TABLE pivots (
+    id INTEGER PRIMARY KEY,
+    career_id INTEGER NOT NULL REFERENCES careers(id),
+    position INTEGER NOT NULL,
+    branch_from_index INTEGER,
+    branch_name TEXT,
+    transition_success TEXT,
+    body_json TEXT NOT NULL
+);
+CREATE TABLE stages (
+    id INTEGER PRIMARY KEY,
+    career_id INTEGER NOT NULL REFERENCES careers(id),
+    pivot_id INTEGER REFERENCES pivots(id),
+    list_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    level TEXT,
+    cumulative_years REAL,
+    salary TEXT,
+    salary_min INTEGER,
+    salary_max INTEGER,
+    time_to_next REAL,
+    remote_friendly INTEGER,
+    body_json TEXT NOT NULL
+);
+CREATE TABLE skills (
+    career_id INTEGER NOT NULL REFERENCES careers(id),
+    position INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    complexity TEXT
+);
+CREATE TABLE domain_bonuses (
+    dataset_id INTEGER NOT NULL REFERENCES datasets(id),
+    domain TEXT NOT NULL,
+    field TEXT NOT NULL,
+    bonus_multiplier REAL NOT NULL
+);
+CREATE INDEX careers_key ON careers(career_key, dataset_id);
+CREATE INDEX careers_category ON careers(category);
+CREATE INDEX pivots_career ON pivots(career_id, position);
+CREATE INDEX stages_career ON stages(career_id, pivot_id, position);
+CREATE INDEX stages_level ON stages(level);
+CREATE INDEX skills_skill ON skills(skill);
+CREATE INDEX skills_career ON skills(career_id);
+CREATE INDEX domain_bonuses_field ON domain_bonuses(field);
+"""
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def find_container(document: Dict[str, Any]) -> Optional[str]:
+    """The top-level member that holds this file's careers, if any."""
+    for name in CAREER_CONTAINERS:
+        if isinstance(document.get(name), (dict, list)):
+            return name
+    return None
+
+
+def iter_careers(careers: Any) -> List[Tuple[str, Dict[str, Any]]]:
+    if isinstance(careers, dict):
+        return list(careers.items())
+    return [(career.get('id', str(i)), career) for i, career in enumerate(careers)]
+
+
+def insert_stages(db: sqlite3.Connection, career_id: int, pivot_id: Optional[int], list_name: str,
+                  stages: List[Dict[str, Any]]) -> None:
+    rows = []
+    for position, stage in enumerate(stages):
+        salary = stage.get('salary', stage.get('salary_range'))
+        try:
+            salary_min, salary_max, _ = parse_salary_range(salary)
+        except SalaryParseError:
+            salary_min = salary_max = None
+        remote = stage.get('remoteFriendly')
+        rows.append((
+            career_id, pivot_id, list_name, position, stage.get('title'), stage.get('level'),
+            stage.get('cumulativeYears'), salary if isinstance(salary, str) else None, salary_min, salary_max,
+            stage.get('timeToNext'), None if remote is None else int(bool(remote)), dumps(stage)
+        ))
+    db.executemany(
+        'INSERT INTO stages (career_id, pivot_id, list_name, position, title, level, cumulative_years, salary, '
+        'salary_min, salary_max, time_to_next, remote_friendly, body_json) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)',
+        rows
+    )
+
+
+def insert_skills(db: sqlite3.Connection, career_id: int, skills: Any) -> None:
+    if isinstance(skills, dict):
+        complexity = skills.get('complexity_levels', {})
+        names = skills.get('required', [])
+    elif isinstance(skills, list):
+        complexity = {}
+        names = skills
+    else:
+        return
+    db.executemany(
+        'INSERT INTO skills (career_id, position, skill, complexity) VALUES (?,?,?,?)',
+        [(career_id, i, name, complexity.get(name)) for i, name in enumerate(names) if isinstance(name, str)]
+    )
+
+
+def insert_career(db: sqlite3.Connection, dataset_id: int, position: int, career_key: str,
+                  career: Dict[str, Any]) -> None:
+    # Child lists are kept as empty placeholders so key order survives the round trip
+    body = {key: [] if key in CHILD_LISTS and isinstance(value, list) else value
+            for key, value in career.items()}
+    cursor = db.execute(
+        'INSERT INTO careers (dataset_id, position, career_key, name, category, body_json) VALUES (?,?,?,?,?,?)',
+        (dataset_id, position, career_key, career.get('name'), career.get('category'), dumps(body))
+    )
+    career_id = cursor.lastrowid
+    for list_name in STAGE_LISTS:
+        if isinstance(career.get(list_name), list):
+            insert_stages(db, career_id, None, list_name, career[list_name])
+    pivots = career.get('pivot_opportunities')
+    for pivot_position, pivot in enumerate(pivots if isinstance(pivots, list) else []):
+        pivot_body = {key: [] if key == 'stages' and isinstance(value, list) else value
+                      for key, value in pivot.items()}
+        cursor = db.execute(
+            'INSERT INTO pivots (career_id, position, branch_from_index, branch_name, transition_success, body_json) '
+            'VALUES (?,?,?,?,?,?)',
+            (career_id, pivot_position, pivot.get('branchFromIndex'), pivot.get('branchName'),
+             pivot.get('transitionSuccess'), dumps(pivot_body))
+        )
+        if isinstance(pivot.get('stages'), list):
+            insert_stages(db, career_id, cursor.lastrowid, 'stages', pivot['stages'])
+    insert_skills(db, career_id, career.get('skills'))
+
+
+def insert_dataset(db: sqlite3.Connection, file_name: str, document: Any) -> None:
+    container = find_container(document) if isinstance(document, dict) else None
+    residual = document
+    careers = []
+    if container:
+        residual = {key: value for key, value in document.items() if key != container}
+        careers = document[container]
+    cursor = db.execute(
+        'INSERT INTO datasets (file, container, container_is_list, residual_json) VALUES (?,?,?,?)',
+        (file_name, container, int(isinstance(careers, list)), dumps(residual))
+    )
+    dataset_id = cursor.lastrowid
+    for position, (career_key, career) in enumerate(iter_careers(careers)):
+        insert_career(db, dataset_id, position, career_key, career)
+    if isinstance(document, dict) and isinstance(document.get('phd_domains'), dict):
+        db.executemany(
+            'INSERT INTO domain_bonuses (dataset_id, domain, field, bonus_multiplier) VALUES (?,?,?,?)',
+            [(dataset_id, domain, field, spec.get('bonus_multiplier', 1.0))
+             for domain, spec in document['phd_domains'].items() for field in spec.get('fields', [])]
+        )
+
+
+def is_generated(file_name: str) -> bool:
+    return file_name in GENERATED_FILES or file_name.endswith(GENERATED_SUFFIXES)
+
+
+def source_files(data_dir: str) -> List[str]:
+    """The source JSON documents in data_dir, leaving out the artifacts the tools generate there."""
+    return sorted(path for path in glob.glob(os.path.join(data_dir, '*.json'))
+                  if not is_generated(os.path.basename(path)))
+
+
+def load_documents(paths: List[str]):
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield os.path.basename(path), json.load(f)
+
+
+def export_documents(documents, db_path: str = DEFAULT_DB_PATH) -> int:
+    """Build the database from (file_name, document) pairs. Returns the number of documents exported."""
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = sqlite3.connect(tmp_path)
+    count = 0
+    try:
+        db.executescript(SCHEMA)
+        for file_name, document in documents:
+            insert_dataset(db, file_name, document)
+            count += 1
+        db.commit()
+    finally:
+        db.close()
+    os.replace(tmp_path, db_path)
+    return count
+
+
+def export(data_dir: str = DATA_DIR, db_path: str = DEFAULT_DB_PATH) -> int:
+    """Build the database from every JSON file in data_dir. Returns the number of files exported."""
+    return export_documents(load_documents(source_files(data_dir)), db_path)
+
+
+def rebuild_stages(db: sqlite3.Connection, career_id: int, pivot_id: Optional[int], list_name: str) -> List[Any]:
+    if pivot_id is None:
+        rows = db.execute('SELECT body_json FROM stages WHERE career_id = ? AND pivot_id IS NULL AND list_name = ? '
+                          'ORDER BY position', (career_id, list_name))
+    else:
+        rows = db.execute('SELECT body_json FROM stages WHERE career_id = ? AND pivot_id = ? ORDER BY position',
+                          (career_id, pivot_id))
+    return [json.loads(body) for (body,) in rows]
+
+
+def rebuild_career(db: sqlite3.Connection, career_id: int, body_json: str) -> Dict[str, Any]:
+    """Reassemble one career from its rows."""
+    career = json.loads(body_json)
+    for list_name in STAGE_LISTS:
+        if career.get(list_name) == []:
+            career[list_name] = rebuild_stages(db, career_id, None, list_name)
+    if career.get('pivot_opportunities') == []:
+        for pivot_id, pivot_body in db.execute('SELECT id, body_json FROM pivots WHERE career_id = ? ORDER BY position',
+                                               (career_id,)).fetchall():
+            pivot = json.loads(pivot_body)
+            if pivot.get('stages') == []:
+                pivot['stages'] = rebuild_stages(db, career_id, pivot_id, 'stages')
+            career['pivot_opportunities'].append(pivot)
+    return career
+
+
+def rebuild_dataset(db: sqlite3.Connection, file_name: str) -> Any:
+    """Reassemble a source document from the database."""
+    dataset_id, container, is_list, residual_json = db.execute(
+        'SELECT id, container, container_is_list, residual_json FROM datasets WHERE file = ?', (file_name,)
+    ).fetchone()
+    document = json.loads(residual_json)
+    if container:
+        careers = db.execute('SELECT id, career_key, body_json FROM careers WHERE dataset_id = ? ORDER BY position',
+                             (dataset_id,)).fetchall()
+        rebuilt = [(key, rebuild_career(db, career_id, body)) for career_id, key, body in careers]
+        document[container] = [career for _, career in rebuilt] if is_list else dict(rebuilt)
+    return document
+
+
+def verify(data_dir: str = DATA_DIR, db_path: str = DEFAULT_DB_PATH) -> List[str]:
+    """Compare every source file with its reconstruction. Returns a list of problems."""
+    problems = []
+    db = sqlite3.connect(db_path)
+    try:
+        exported = {name for (name,) in db.execute('SELECT file FROM datasets')}
+        for path in source_files(data_dir):
+            name = os.path.basename(path)
+            if name not in exported:
+                problems.append(f"{name}: missing from database")
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                source = json.load(f)
+            if rebuild_dataset(db, name) != source:
+                problems.append(f"{name}: reconstruction differs from source")
+    finally:
+        db.close()
+    return problems
+
+
+def main(argv: Optional[List[str]] = None):
+    """Export data/*.json to SQLite and optionally verify the round trip."""
+    parser = argparse.ArgumentParser(description='Compile the career datasets into an indexed SQLite database.')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='directory of source JSON files')
+    parser.add_argument('-o', '--output', default=DEFAULT_DB_PATH, help='SQLite database path')
+    parser.add_argument('--verify', action='store_true', help='round-trip check the database against the source JSON')
+    parser.add_argument('--verify-only', action='store_true', help='verify an existing database without rebuilding it')
+    args = parser.parse_args(argv)
+
+    if not args.verify_only:
+        count = export(args.data_dir, args.output)
+        print(f"Exported {count} files to {args.output}")
+
+    if args.verify or args.verify_only:
+        problems = verify(args.data_dir, args.output)
+        for problem in problems:
+            print(problem)
+        print("Round trip OK" if not problems else f"Round trip FAILED for {len(problems)} files")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
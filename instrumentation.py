@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Shared timing and memory instrumentation for the dataset maintenance scripts.
+
+Scripts wrap their work in `profiler.phase(name)` and `profiler.career(key)`.
+Both are no-ops until `profiler.start()` is called (the scripts' `--profile`
+flag), after which wall time, call counts and tracemalloc peak memory are
+recorded and can be written as a JSON report to diff between runs.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Any, Optional
+
+TOP_N_CAREERS = 10
+
+
+class Profiler:
+    """Per-phase and per-career timings for one script run."""
+
+    def __init__(self):
+        self.enabled = False
+        self.script = None
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.careers: Dict[str, float] = {}
+        self._peaks: List[int] = []  # running peak of each open phase
+        self._started = 0.0
+
+    def start(self, script: str) -> None:
+        """Begin recording. Memory tracing slows the run down noticeably."""
+        self.enabled = True
+        self.script = script
+        self.phases.clear()
+        self.careers.clear()
+        tracemalloc.start()
+        self._started = time.perf_counter()
+
+    def phase(self, name: str):
+        """Context manager timing one occurrence of a phase; repeated phases accumulate."""
+        return self._phase(name) if self.enabled else nullcontext()
+
+    def career(self, career_key: str):
+        """Context manager timing the processing of one career."""
+        return self._career(career_key) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _phase(self, name: str):
+        # tracemalloc has a single peak counter, so each open phase keeps the
+        # highest peak seen before its nested phases reset the counter
+        parent_peak = tracemalloc.get_traced_memory()[1]
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], parent_peak)
+        tracemalloc.reset_peak()
+        self._peaks.append(0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            stats = self.phases.setdefault(name, {'seconds': 0.0, 'calls': 0, 'peak_bytes': 0})
+            stats['seconds'] += elapsed
+            stats['calls'] += 1
+            stats['peak_bytes'] = max(stats['peak_bytes'], peak)
+
+    @contextmanager
+    def _career(self, career_key: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.careers[career_key] = self.careers.get(career_key, 0.0) + time.perf_counter() - start
+
+    def report(self, top_n: int = TOP_N_CAREERS) -> Dict[str, Any]:
+        """Summary of everything recorded so far."""
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        slowest = sorted(self.careers.items(), key=lambda item: item[1], reverse=True)[:top_n]
+        return {
+            'script': self.script,
+            'argv': sys.argv[1:],
+            'total_seconds': time.perf_counter() - self._started,
+            'current_bytes': current,
+            'peak_bytes': max([peak] + [stats['peak_bytes'] for stats in self.phases.values()]),
+            'phases': self.phases,
+            'careers': {
+                'count': len(self.careers),
+                'total_seconds': sum(self.careers.values()),
+                'slowest': [{'career': key, 'seconds': seconds} for key, seconds in slowest]
+            }
+        }
+
+    def finish(self, report_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Stop recording, print a short summary to stderr and write the JSON report."""
+        if not self.enabled:
+            return None
+        report = self.report()
+        tracemalloc.stop()
+        self.enabled = False
+        print_summary(report)
+        if report_path:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+        return report
+
+
+def print_summary(report: Dict[str, Any], out=sys.stderr) -> None:
+    print(f"=== PROFILE: {report['script']} ({report['total_seconds']:.3f}s, "
+          f"peak {report['peak_bytes'] / 1e6:.1f} MB) ===", file=out)
+    for name, stats in report['phases'].items():
+        print(f"{name}: {stats['seconds']:.3f}s over {stats['calls']} calls, "
+              f"peak {stats['peak_bytes'] / 1e6:.1f} MB", file=out)
+    for entry in report['careers']['slowest']:
+        print(f"  slow career {entry['career']}: {entry['seconds'] * 1000:.2f} ms", file=out)
+
+
+def add_profile_argument(parser, script: str) -> None:
+    """Add the shared `--profile` flag and its `--profile-report PATH` option to a script's argument parser."""
+    parser.add_argument('--profile', action='store_true', help='record per-phase time and peak memory')
+    parser.add_argument('--profile-report', default=f"{script}-profile.json", metavar='PATH',
+                        help=f"where --profile writes its JSON report (default: {script}-profile.json)")
+
+
+profiler = Profiler()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compile the declarative pivot rule file (pivot_rules.json) into an immutable,
+pre-parsed plan that enhance_pivots.py applies to every career in one pass.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, NamedTuple, Optional, Tuple
+
+PIVOT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pivot_rules.json')
+
+
+class RoleRule(NamedTuple):
+    """One stage of a pivot branch, with its salary offset already parsed."""
+    title: str
+    short_title: str
+    level: str
+    years_offset: float
+    salary_offset: Optional[Tuple[int, int]]
+    salary_text: str
+
+
+class BranchRule(NamedTuple):
+    """A pivot branch anchored at a main_path stage index."""
+    index: int
+    name: str
+    color: str
+    success: str
+    roles: Tuple[RoleRule, ...]
+
+
+class PivotPlan(NamedTuple):
+    """Compiled pivot rules: category -> branches, plus version information."""
+    version: str
+    digest: str
+    categories: Mapping[str, Tuple[BranchRule, ...]]
+
+    @property
+    def template_version(self) -> str:
+        return f"{self.version}:{self.digest[:12]}"
+
+
+def format_offset(offset: Tuple[int, int]) -> str:
+    """Render a numeric salary offset the way the original templates wrote it."""
+    return f"+${offset[0] // 1000}k-${offset[1] // 1000}k"
+
+
+def compile_role(raw: Dict[str, Any]) -> RoleRule:
+    """Compile a single role rule."""
+    if 'salaryOffset' in raw:
+        low, high = (int(x) for x in raw['salaryOffset'])
+        offset = (low, high)
+        salary_text = format_offset(offset)
+    else:
+        offset = None
+        salary_text = raw['salary']
+    return RoleRule(
+        title=raw['title'],
+        short_title=raw['shortTitle'],
+        level=raw['level'],
+        years_offset=raw['yearsOffset'],
+        salary_offset=offset,
+        salary_text=salary_text
+    )
+
+
+def compile_rules(raw: Dict[str, Any]) -> PivotPlan:
+    """Compile a parsed rule document into an immutable PivotPlan."""
+    categories = {}
+    for category, branches in raw['categories'].items():
+        categories[category] = tuple(
+            BranchRule(
+                index=int(branch['branchFromIndex']),
+                name=branch['branchName'],
+                color=branch['color'],
+                success=branch['transitionSuccess'],
+                roles=tuple(compile_role(role) for role in branch['roles'])
+            )
+            for branch in branches
+        )
+    payload = json.dumps(raw['categories'], sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return PivotPlan(
+        version=str(raw.get('version', '0')),
+        digest=hashlib.sha256(payload.encode('utf-8')).hexdigest(),
+        categories=MappingProxyType(categories)
+    )
+
+
+@lru_cache(maxsize=None)
+def load_plan(rules_path: str = PIVOT_RULES_PATH) -> PivotPlan:
+    """Load and compile a rule file. Plans are cached per path for the process lifetime."""
+    with open(rules_path, 'r', encoding='utf-8') as f:
+        return compile_rules(json.load(f))
+
+
+def plan_as_templates(plan: PivotPlan) -> Dict[str, List[Dict[str, Any]]]:
+    """Expand a plan back into the legacy template dict shape."""
+    return {
+        category: [
+            {
+                'index': branch.index, 'name': branch.name, 'color': branch.color, 'success': branch.success,
+                'roles': [
+                    {'title': role.title, 'short': role.short_title, 'level': role.level,
+                     'years_offset': role.years_offset, 'salary': role.salary_text}
+                    for role in branch.roles
+                ]
+            }
+            for branch in branches
+        ]
+        for category, branches in plan.categories.items()
+    }
@@ -2,73 +2,58 @@
 """
 Script to restore missing pivot opportunities for all careers.
 Adds branchFromIndex 2 and 3 pivot opportunities to all career paths.
+
+Large datasets are restored in shards across a process pool (see
+timeline_pool.py). Workers receive only the members restoration reads and
+send back the pivots to append, which are merged in the original career
+order, so the output and summary are identical to a serial run.
 """
 
-import json
+import argparse
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 
-def main():
-    file_path = "C:\\Users\\virga\\documents\\Github\\IndustryCareerGuide\\data\\careerTimelineData_PhDOptimized.json"
-    
-    # Read the file
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    careers = data["career_timelines"]
-    colors = ["#DC2626", "#7C3AED", "#F59E0B", "#059669"]
-    
-    # Track statistics
-    total_restored = 0
-    career_stats = {}
-    
-    # Career category definitions for pivot types
-    tech_careers = [
-        "data_scientist", "software_engineering", "ai_ml_engineer", "devops_engineer", 
-        "cybersecurity_analyst", "bioinformatics_scientist", "digital_health_scientist",
-        "biomedical_engineer", "systems_engineer", "electrical_engineer"
-    ]
-    
-    science_careers = [
-        "r_and_d_scientist", "biostatistician", "process_development_scientist",
-        "research_scientist", "environmental_scientist", "materials_scientist",
-        "chemical_engineer", "mechanical_engineer"
-    ]
-    
-    business_careers = [
-        "product_manager", "management_consultant", "venture_capital_analyst",
-        "business_development_manager", "market_analyst", "financial_analyst",
-        "operations_manager", "program_management"
-    ]
-    
-    for career_key, career_data in careers.items():
-        original_pivot_count = len(career_data.get("pivot_opportunities", []))
-        
-        # Get existing pivot colors to continue the pattern
-        existing_pivots = career_data.get("pivot_opportunities", [])
-        used_colors = set()
-        for pivot in existing_pivots:
-            used_colors.add(pivot.get("color", ""))
-        
-        # Find next available colors
-        available_colors = [c for c in colors if c not in used_colors]
-        if not available_colors:  # If all colors used, start over
-            available_colors = colors
-        
-        # Determine career category for appropriate pivot types
-        if career_key in tech_careers:
-            pivot_2_name = "Technical Leadership"
-            pivot_3_name = "Executive Leadership"
-        elif career_key in science_careers:
-            pivot_2_name = "Research Management"
-            pivot_3_name = "Innovation Leadership"
-        elif career_key in business_careers:
-            pivot_2_name = "Strategy Leadership"
-            pivot_3_name = "Executive Leadership"
-        else:
-            # Default for other careers
-            pivot_2_name = "Leadership Transition"
-            pivot_3_name = "Executive Consulting"
-        
+from career_categorizer import load_categorizer
+from instrumentation import add_profile_argument, profiler
+from snapshot_store import RunSnapshots, add_snapshot_argument
+from timeline_io import DEFAULT_DATA_PATH, load_dataset
+from timeline_pool import PARALLEL_THRESHOLD, pool_workers, shards
+from timeline_writer import FORMATS, format_for_path, stream_transform_careers, write_dataset
+
+COLORS = ["#DC2626", "#7C3AED", "#F59E0B", "#059669"]
+
+# Names of the branchFromIndex 2 and 3 pivots for each career category
+PIVOT_NAMES = {
+    "tech": ("Technical Leadership", "Executive Leadership"),
+    "science": ("Research Management", "Innovation Leadership"),
+    "business": ("Strategy Leadership", "Executive Leadership"),
+    "general": ("Leadership Transition", "Executive Consulting")
+}
+
+
+def restore_career_pivots(career_key, career_data, categorizer=None):
+    """Add the branchFromIndex 2 and 3 pivots to one career if missing; returns its stats."""
+    original_pivot_count = len(career_data.get("pivot_opportunities", []))
+
+    # Get existing pivot colors to continue the pattern
+    existing_pivots = career_data.get("pivot_opportunities", [])
+    used_colors = set()
+    for pivot in existing_pivots:
+        used_colors.add(pivot.get("color", ""))
+
+    # Find next available colors
+    available_colors = [c for c in COLORS if c not in used_colors]
+    if not available_colors:  # If all colors used, start over
+        available_colors = COLORS
+
+    # Determine career category for appropriate pivot types
+    with profiler.phase('categorize'):
+        category = (categorizer or load_categorizer()).classify(career_key, career_data)
+        pivot_2_name, pivot_3_name = PIVOT_NAMES.get(category, PIVOT_NAMES["general"])
+
+    with profiler.phase('template apply'):
         # Add branchFromIndex 2 pivot (mid-senior transition)
         pivot_2 = {
             "branchFromIndex": 2,
@@ -105,7 +90,7 @@ def main():
                 }
             ]
         }
-        
+
         # Add branchFromIndex 3 pivot (leadership/executive transition)
         pivot_3 = {
             "branchFromIndex": 3,
@@ -142,52 +127,186 @@ def main():
                 }
             ]
         }
-        
-        # Check if pivots already exist for these indices
-        existing_branch_indices = set()
-        for pivot in existing_pivots:
-            existing_branch_indices.add(pivot.get("branchFromIndex", 0))
-        
-        restored_count = 0
-        
-        # Add pivot 2 if not exists
-        if 2 not in existing_branch_indices:
-            career_data["pivot_opportunities"].append(pivot_2)
-            restored_count += 1
-        
-        # Add pivot 3 if not exists
-        if 3 not in existing_branch_indices:
-            career_data["pivot_opportunities"].append(pivot_3)
-            restored_count += 1
-        
-        total_restored += restored_count
-        current_pivot_count = len(career_data["pivot_opportunities"])
-        career_stats[career_key] = {
-            "name": career_data["name"],
-            "original": original_pivot_count,
-            "restored": restored_count,
-            "total": current_pivot_count
-        }
-    
-    # Write back the updated data
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
+
+    # Check if pivots already exist for these indices
+    existing_branch_indices = set()
+    for pivot in existing_pivots:
+        existing_branch_indices.add(pivot.get("branchFromIndex", 0))
+
+    restored_count = 0
+
+    # Add pivot 2 if not exists
+    if 2 not in existing_branch_indices:
+        career_data["pivot_opportunities"].append(pivot_2)
+        restored_count += 1
+
+    # Add pivot 3 if not exists
+    if 3 not in existing_branch_indices:
+        career_data["pivot_opportunities"].append(pivot_3)
+        restored_count += 1
+
+    return {
+        "name": career_data["name"],
+        "original": original_pivot_count,
+        "restored": restored_count,
+        "total": len(career_data["pivot_opportunities"])
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Restore branchFromIndex 2 and 3 pivot opportunities.')
+    parser.add_argument('file_path', nargs='?', default=DEFAULT_DATA_PATH, help='career timeline JSON file')
+    parser.add_argument('-o', '--output',
+                        help='stream the restored dataset here (snapshots are only recorded if this is file_path)')
+    parser.add_argument('--format', choices=FORMATS,
+                        help='stream the output in this format (default: ndjson for .ndjson/.jsonl, else pretty)')
+    parser.add_argument('--workers', type=int,
+                        help='worker processes for large datasets (default: CPU count; 1 disables the pool)')
+    add_profile_argument(parser, 'restore_pivots')
+    add_snapshot_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiler.start('restore_pivots')
+    try:
+        if args.output or args.format:
+            output = args.output or args.file_path
+            try:
+                format_for_path(output, args.format)
+            except ValueError as e:
+                parser.error(str(e))
+            snapshots = RunSnapshots.for_output('restore_pivots', args.file_path, output, not args.no_snapshot)
+            run_streaming(args.file_path, output, args.format, args.workers, snapshots)
+        else:
+            run(args.file_path, RunSnapshots('restore_pivots', args.file_path, enabled=not args.no_snapshot),
+                args.workers)
+    finally:
+        profiler.finish(args.profile_report)
+
+
+def run(file_path, snapshots=None, workers=None):
+    # Read the file
+    with profiler.phase('load'):
+        data = load_dataset(file_path)
+    career_stats = restore_all_pivots(data["career_timelines"], workers)
+
+    # Write back the updated data, in the layout the file name implies (NDJSON for .ndjson/.jsonl)
+    if snapshots:
+        snapshots.before(file_path)
+    with profiler.phase('write'):
+        write_dataset(data, file_path)
+    if snapshots:
+        snapshots.after(data, file_path)
+
+    print_summary(career_stats)
+
+
+def run_streaming(file_path, output_path, fmt=None, workers=None, snapshots=None):
+    """Restore pivots while streaming file_path into output_path.
+
+    Memory stays bounded by a single career, or by the shards in flight when
+    restoring in parallel; see timeline_writer.py for the formats.
+    """
+    career_stats = {}
+    if snapshots:
+        snapshots.before(file_path)
+    stream_transform_careers(file_path, output_path,
+                             lambda careers: restore_careers(careers, career_stats, workers), fmt)
+    if snapshots:
+        snapshots.after_file(output_path)
+    print_summary(career_stats)
+
+
+def restore_all_pivots(careers, workers=None):
+    """Restore pivots for every career in place; returns the per-career stats in career order."""
+    career_stats = {}
+    for _ in restore_careers(careers.items(), career_stats, workers):
+        pass
+    return career_stats
+
+
+def restore_careers(careers, career_stats, workers=None):
+    """Restore (career_key, career_data) pairs, yielding them back in order.
+
+    Fills career_stats as careers are yielded. Streams of PARALLEL_THRESHOLD
+    careers or more go through a process pool unless workers is 1 or only
+    one CPU is available.
+    """
+    careers = iter(careers)
+    head = list(islice(careers, PARALLEL_THRESHOLD))
+    workers = pool_workers(workers, len(head))
+    if workers == 1:
+        categorizer = load_categorizer()
+        for career_key, career_data in chain(head, careers):
+            with profiler.career(career_key):
+                career_stats[career_key] = restore_career_pivots(career_key, career_data, categorizer)
+            yield career_key, career_data
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a couple of shards per worker in flight so the pool stays busy
+        # without reading the whole stream ahead
+        pending = deque()
+        for shard in shards(chain(head, careers)):
+            pending.append((shard, pool.submit(restore_shard, [(key, restore_view(career)) for key, career in shard])))
+            if len(pending) > 2 * workers:
+                yield from merge_shard(*pending.popleft(), career_stats)
+        while pending:
+            yield from merge_shard(*pending.popleft(), career_stats)
+
+
+def restore_view(career_data):
+    """The members of a career that restore_career_pivots and the categorizer read.
+
+    Keys absent from the career stay absent, so a worker fails exactly where a
+    serial run would.
+    """
+    view = {key: career_data[key] for key in ("name", "targetIndustries") if key in career_data}
+    if "pivot_opportunities" in career_data:
+        view["pivot_opportunities"] = [
+            {key: pivot[key] for key in ("color", "branchFromIndex") if key in pivot}
+            for pivot in career_data["pivot_opportunities"]
+        ]
+    return view
+
+
+def restore_shard(shard):
+    """Worker side: (appended pivots, stats) for each (career_key, restore_view) pair."""
+    categorizer = load_categorizer()
+    results = []
+    for career_key, view in shard:
+        original = len(view.get("pivot_opportunities", []))
+        stats = restore_career_pivots(career_key, view, categorizer)
+        results.append((view.get("pivot_opportunities", [])[original:], stats))
+    return results
+
+
+def merge_shard(shard, future, career_stats):
+    for (career_key, career_data), (restored, stats) in zip(shard, future.result()):
+        if restored:
+            career_data["pivot_opportunities"].extend(restored)
+        career_stats[career_key] = stats
+        yield career_key, career_data
+
+
+def print_summary(career_stats):
+    total_restored = sum(s["restored"] for s in career_stats.values())
+
     # Generate summary report
     print(f"=== PIVOT OPPORTUNITIES RESTORATION SUMMARY ===")
     print(f"Total pivot opportunities restored: {total_restored}")
-    print(f"Total careers processed: {len(careers)}")
+    print(f"Total careers processed: {len(career_stats)}")
     print()
     print("Per-career breakdown:")
     print("-" * 60)
-    
+
     for career_key, stats in career_stats.items():
         if stats["restored"] > 0:
             print(f"{stats['name']}: {stats['original']} -> {stats['total']} (+{stats['restored']})")
-    
+
     print()
     print(f"Careers with 4+ pivot opportunities: {sum(1 for s in career_stats.values() if s['total'] >= 4)}")
     print(f"Careers with 3+ pivot opportunities: {sum(1 for s in career_stats.values() if s['total'] >= 3)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
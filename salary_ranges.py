@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Parsing for the salary range strings used throughout the career timeline data,
+e.g. "$150k-$200k", "$400k-$1M+*" or "$0-$120k*".
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+SALARY_RANGE = re.compile(
+    r'^\s*\$?(\d+(?:\.\d+)?)\s*([kKmM]?)\s*-\s*\$?(\d+(?:\.\d+)?)\s*([kKmM]?)\s*(\+?)\s*\*?\s*$'
+)
+
+UNIT_MULTIPLIERS = {'': 1, 'k': 1000, 'm': 1000000}
+
+
+class SalaryParseError(ValueError):
+    """Raised when a salary string is not a recognised "$min-$max" range."""
+
+
+class SalaryRange(NamedTuple):
+    minimum: int
+    maximum: int
+    open_ended: bool
+
+
+def _amount(number: str, unit: str) -> int:
+    return int(round(float(number) * UNIT_MULTIPLIERS[unit.lower()]))
+
+
+@lru_cache(maxsize=4096)
+def parse_salary_range(text: str) -> SalaryRange:
+    """Parse a salary range string into whole-dollar bounds.
+
+    Trailing "+" marks an open-ended upper bound and a trailing "*" footnote
+    marker is ignored. Anything else (e.g. "Equity-based") raises SalaryParseError.
+    """
+    if not isinstance(text, str):
+        raise SalaryParseError(f"salary must be a string, got {type(text).__name__}")
+    match = SALARY_RANGE.match(text)
+    if not match:
+        raise SalaryParseError(f"unrecognised salary range {text!r}")
+    low_number, low_unit, high_number, high_unit, plus = match.groups()
+    return SalaryRange(_amount(low_number, low_unit), _amount(high_number, high_unit), bool(plus))
+
+
+def format_salary_range(minimum: int, maximum: int) -> str:
+    """Render dollar bounds in the dataset's "$150k-$200k" style."""
+    return f"${minimum // 1000}k-${maximum // 1000}k"
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Split a career timeline dataset into one minified shard per career.
+
+Writes <out>/careers/<career_key>.json for every entry of `career_timelines`
+plus <out>/manifest.json with each shard's file, content hash and byte size and
+the dataset metadata (version, lastUpdated, changeLog). Career keys are
+percent-encoded into file names, so any key maps to its own file inside
+careers/ and none can collide with the manifest. Shards whose hash is unchanged are
+left untouched, so consumers and caches only see the careers that changed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from urllib.parse import quote
+from typing import Dict, List, Any, Optional
+
+from timeline_io import DATA_DIR, DEFAULT_DATA_PATH, write_text
+from timeline_stream import iter_career_timelines
+
+DEFAULT_OUT_DIR = os.path.join(DATA_DIR, 'careerTimelineShards')
+MANIFEST_NAME = 'manifest.json'
+SHARD_DIR = 'careers'
+METADATA_FIELDS = ('version', 'lastUpdated', 'changeLog')
+
+
+def minify(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_manifest(out_dir: str) -> Dict[str, Any]:
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {'shards': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def shard_file(career_key: str) -> str:
+    """Manifest path of a career's shard, relative to the output directory."""
+    return f"{SHARD_DIR}/{quote(career_key, safe='')}.json"
+
+
+def resolve(out_dir: str, file_name: str) -> Optional[str]:
+    """Filesystem path of a manifest entry, or None if it points outside out_dir."""
+    root = os.path.abspath(out_dir)
+    path = os.path.abspath(os.path.join(root, *file_name.split('/')))
+    return path if os.path.commonpath([root, path]) == root and path != root else None
+
+
+def build_shards(source: str = DEFAULT_DATA_PATH, out_dir: str = DEFAULT_OUT_DIR) -> Dict[str, List[str]]:
+    """Write changed shards and the manifest. Returns the written, unchanged and removed keys."""
+    os.makedirs(os.path.join(out_dir, SHARD_DIR), exist_ok=True)
+    previous = load_manifest(out_dir).get('shards', {})
+    header: Dict[str, Any] = {}
+    shards = {}
+    result = {'written': [], 'unchanged': [], 'removed': []}
+
+    for career_key, career_data in iter_career_timelines(source, header):
+        text = minify(career_data)
+        payload = text.encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()
+        file_name = shard_file(career_key)
+        shards[career_key] = {
+            'file': file_name,
+            'name': career_data.get('name', career_key),
+            'sha256': digest,
+            'bytes': len(payload)
+        }
+        path = resolve(out_dir, file_name)
+        old = previous.get(career_key, {})
+        if old.get('sha256') == digest and old.get('file') == file_name and os.path.exists(path):
+            result['unchanged'].append(career_key)
+            continue
+        write_text(text, path)
+        result['written'].append(career_key)
+
+    # Also drops files left at an older location (shards used to sit next to the manifest)
+    current = {entry['file'] for entry in shards.values()} | {MANIFEST_NAME}
+    for career_key, entry in previous.items():
+        if entry.get('file') not in current:
+            path = resolve(out_dir, entry.get('file', ''))
+            if path and os.path.isfile(path):
+                os.remove(path)
+        if career_key not in shards:
+            result['removed'].append(career_key)
+
+    metadata = header.get('metadata', {})
+    manifest = {field: metadata.get(field) for field in METADATA_FIELDS}
+    manifest['source'] = os.path.basename(source)
+    manifest['totalBytes'] = sum(entry['bytes'] for entry in shards.values())
+    manifest['shards'] = shards
+    write_text(json.dumps(manifest, indent=2, ensure_ascii=False), os.path.join(out_dir, MANIFEST_NAME))
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    """Build per-career shards for a timeline dataset."""
+    parser = argparse.ArgumentParser(description='Shard a career timeline dataset into per-career files.')
+    parser.add_argument('source', nargs='?', default=DEFAULT_DATA_PATH, help='career timeline JSON file')
+    parser.add_argument('-o', '--out-dir', default=DEFAULT_OUT_DIR, help='shard output directory')
+    args = parser.parse_args(argv)
+
+    result = build_shards(args.source, args.out_dir)
+    print(f"Shards written: {len(result['written'])}")
+    print(f"Shards unchanged: {len(result['unchanged'])}")
+    print(f"Shards removed: {len(result['removed'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Precomputed skill-gap matrix for action plans.
+
+For every PhD field (phdSpecificStrengths in gapPersonalization.json) x career
+x stage (careerTrajectories.json) the matrix holds:
+
+- gaps: the stage's core and developing skills that none of the field's
+  strengths covers, in the order the stage lists them
+- developing: the stage's developing skills in the order to work on them.
+  Gaps come first, then skills that later stages of the career need as core
+  skills, then the rest in file order.
+
+Every skill is interned once in a vocabulary and skill sets are bitsets over
+it (Python ints, stored as hex strings), so building a row is a handful of
+integer operations and answering a request is one dictionary lookup.
+
+A skill counts as covered when all of its words occur in a single strength
+("Experimental design" is covered by "Experimental design and hypothesis
+testing expertise"). Words are lowercased, stop words dropped and plurals
+folded.
+
+Rebuilds are incremental. The artifact records a hash per field and per
+career, and only rows whose field or career changed are recomputed. The
+vocabulary is append-only across incremental builds so existing bit positions
+stay valid; --full rebuilds from scratch and drops skills nobody uses.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, List, Any, FrozenSet, NamedTuple, Optional, Tuple
+
+from instrumentation import add_profile_argument, profiler
+from timeline_io import DATA_DIR, write_text
+
+TRAJECTORIES_PATH = os.path.join(DATA_DIR, 'careerTrajectories.json')
+PERSONALIZATION_PATH = os.path.join(DATA_DIR, 'gapPersonalization.json')
+MATRIX_PATH = os.path.join(DATA_DIR, 'skillGapMatrix.json')
+
+# Bump when the matching or ranking rules change; it invalidates every stored row
+MATRIX_VERSION = 1
+
+STOP_WORDS = frozenset(['a', 'an', 'and', 'for', 'in', 'of', 'on', 'the', 'to', 'with'])
+WORD = re.compile(r'[a-z0-9]+')
+
+
+class StageGaps(NamedTuple):
+    """The looked-up row for one field, career and stage."""
+    title: str
+    level: str
+    gaps: List[str]
+    developing: List[str]
+
+
+def words(text: str) -> FrozenSet[str]:
+    """Normalized content words of a skill or strength."""
+    result = set()
+    for word in WORD.findall(text.lower()):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        result.add(word)
+    return frozenset(result)
+
+
+def digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def file_digest(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Vocabulary:
+    """Interned skill names and their bit positions."""
+
+    def __init__(self, skills: Optional[List[str]] = None):
+        self.skills: List[str] = []
+        self.index: Dict[str, int] = {}
+        for skill in skills or ():
+            self.add(skill)
+
+    def add(self, skill: str) -> int:
+        bit = self.index.get(skill)
+        if bit is None:
+            bit = self.index[sys.intern(skill)] = len(self.skills)
+            self.skills.append(skill)
+        return bit
+
+    def mask(self, skills: List[str]) -> int:
+        result = 0
+        for skill in skills:
+            result |= 1 << self.add(skill)
+        return result
+
+
+def covered_mask(vocabulary: Vocabulary, strengths: List[str]) -> int:
+    """Bitset of the vocabulary skills covered by any one of the strengths."""
+    strength_words = [words(strength) for strength in strengths]
+    mask = 0
+    for bit, skill in enumerate(vocabulary.skills):
+        skill_words = words(skill)
+        if skill_words and any(skill_words <= strength for strength in strength_words):
+            mask |= 1 << bit
+    return mask
+
+
+def career_rows(vocabulary: Vocabulary, stages: List[Dict[str, Any]], covered: int) -> List[Dict[str, Any]]:
+    """Gap bitset and ranked developing skills for every stage of one career, for one field."""
+    core = [vocabulary.mask(stage.get('core_skills', [])) for stage in stages]
+    rows = []
+    for i, stage in enumerate(stages):
+        required = core[i] | vocabulary.mask(stage.get('developing_skills', []))
+        developing = [vocabulary.index[skill] for skill in dict.fromkeys(stage.get('developing_skills', []))]
+        # Uncovered first, then by how many later stages need the skill as a core skill
+        later_demand = {bit: sum(1 for mask in core[i + 1:] if mask >> bit & 1) for bit in developing}
+        ranked = sorted(developing, key=lambda bit: (covered >> bit & 1, -later_demand[bit]))
+        rows.append({'gaps': format(required & ~covered, 'x'), 'developing': ranked})
+    return rows
+
+
+def build_matrix(trajectories_path: str = TRAJECTORIES_PATH, personalization_path: str = PERSONALIZATION_PATH,
+                 previous: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], int]:
+    """Build the matrix, reusing rows of `previous` whose inputs are unchanged.
+
+    Returns the matrix and the number of (field, career) rows recomputed.
+    """
+    if previous is not None and previous.get('version') != MATRIX_VERSION:
+        previous = None
+    with profiler.phase('load'):
+        trajectories = load_json(trajectories_path)['trajectories']
+        strengths = load_json(personalization_path)['phdSpecificStrengths']
+
+    vocabulary = Vocabulary(previous['skills'] if previous else None)
+    careers = {}
+    for career_key, trajectory in trajectories.items():
+        stages = trajectory.get('stages', [])
+        careers[career_key] = {
+            'hash': digest([[stage.get('title'), stage.get('level'), stage.get('core_skills', []),
+                             stage.get('developing_skills', [])] for stage in stages]),
+            'stages': [{'title': stage.get('title'), 'level': stage.get('level'),
+                        'skills': [vocabulary.add(skill) for skill in
+                                   dict.fromkeys(stage.get('core_skills', []) + stage.get('developing_skills', []))]}
+                       for stage in stages]
+        }
+    fields = {field: {'hash': digest(field_strengths), 'covered': covered_mask(vocabulary, field_strengths)}
+              for field, field_strengths in strengths.items()}
+
+    old_fields = previous['fields'] if previous else {}
+    old_careers = previous['careers'] if previous else {}
+    old_rows = previous['rows'] if previous else {}
+    rows: Dict[str, Dict[str, Any]] = {}
+    recomputed = 0
+    for field, field_info in fields.items():
+        rows[field] = {}
+        field_same = old_fields.get(field, {}).get('hash') == field_info['hash']
+        for career_key, career_info in careers.items():
+            reusable = old_rows.get(field, {}).get(career_key)
+            if field_same and reusable is not None and \
+                    old_careers.get(career_key, {}).get('hash') == career_info['hash']:
+                rows[field][career_key] = reusable
+                continue
+            with profiler.career(f"{field}/{career_key}"):
+                rows[field][career_key] = career_rows(vocabulary, trajectories[career_key].get('stages', []),
+                                                      field_info['covered'])
+            recomputed += 1
+
+    matrix = {
+        'version': MATRIX_VERSION,
+        'sources': {
+            'trajectories': file_digest(trajectories_path),
+            'personalization': file_digest(personalization_path)
+        },
+        'skills': vocabulary.skills,
+        'fields': {field: {'hash': info['hash'], 'covered': format(info['covered'], 'x')}
+                   for field, info in fields.items()},
+        'careers': careers,
+        'rows': rows
+    }
+    return matrix, recomputed
+
+
+def rebuild(matrix_path: str = MATRIX_PATH, trajectories_path: str = TRAJECTORIES_PATH,
+            personalization_path: str = PERSONALIZATION_PATH, full: bool = False) -> int:
+    """Bring the artifact up to date with its sources; returns the number of rows recomputed."""
+    previous = None
+    if not full and os.path.exists(matrix_path):
+        previous = load_json(matrix_path)
+        sources = {'trajectories': file_digest(trajectories_path),
+                   'personalization': file_digest(personalization_path)}
+        if previous.get('version') == MATRIX_VERSION and previous.get('sources') == sources:
+            return 0
+    matrix, recomputed = build_matrix(trajectories_path, personalization_path, previous)
+    with profiler.phase('write'):
+        write_text(json.dumps(matrix, ensure_ascii=False, separators=(',', ':')), matrix_path)
+    return recomputed
+
+
+class SkillGapMatrix:
+    """Read side of the artifact: decoded rows, cached per (field, career, stage)."""
+
+    def __init__(self, matrix: Dict[str, Any]):
+        self.vocabulary = Vocabulary(matrix['skills'])
+        self.careers = matrix['careers']
+        self.rows = matrix['rows']
+        self._cache: Dict[Tuple[str, str, int], Optional[StageGaps]] = {}
+
+    def lookup(self, field: str, career_key: str, stage: int = 0) -> Optional[StageGaps]:
+        """Gaps and ranked developing skills, or None for an unknown field, career or stage."""
+        key = (field, career_key, stage)
+        if key not in self._cache:
+            stages = self.rows.get(field, {}).get(career_key)
+            if stages is None or not 0 <= stage < len(stages):
+                self._cache[key] = None
+            else:
+                row = stages[stage]
+                info = self.careers[career_key]['stages'][stage]
+                gaps = int(row['gaps'], 16)
+                skills = self.vocabulary.skills
+                self._cache[key] = StageGaps(
+                    info['title'], info['level'],
+                    [skills[bit] for bit in info['skills'] if gaps >> bit & 1],
+                    [skills[bit] for bit in row['developing']]
+                )
+        return self._cache[key]
+
+
+@lru_cache(maxsize=None)
+def load_matrix(matrix_path: str = MATRIX_PATH) -> SkillGapMatrix:
+    """Load the artifact. Cached per path for the process lifetime."""
+    return SkillGapMatrix(load_json(matrix_path))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Build the skill-gap matrix or look up one of its rows."""
+    parser = argparse.ArgumentParser(description='Precompute skill gaps per PhD field, career and stage.')
+    parser.add_argument('--matrix', default=MATRIX_PATH, help='artifact path (default: data/skillGapMatrix.json)')
+    add_profile_argument(parser, 'skill_gaps')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='rebuild the rows whose sources changed')
+    build.add_argument('--trajectories', default=TRAJECTORIES_PATH)
+    build.add_argument('--personalization', default=PERSONALIZATION_PATH)
+    build.add_argument('--full', action='store_true', help='ignore the existing artifact and rebuild everything')
+    lookup = sub.add_parser('lookup', help='print the row for a field, career and stage index')
+    lookup.add_argument('field')
+    lookup.add_argument('career')
+    lookup.add_argument('stage', nargs='?', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiler.start('skill_gaps')
+    try:
+        if args.command == 'build':
+            recomputed = rebuild(args.matrix, args.trajectories, args.personalization, args.full)
+            print(f"Recomputed {recomputed} field x career rows" if recomputed else f"{args.matrix} is up to date")
+            return 0
+        row = load_matrix(args.matrix).lookup(args.field, args.career, args.stage)
+        if row is None:
+            print(f"No row for {args.field} / {args.career} / stage {args.stage}", file=sys.stderr)
+            return 1
+        print(json.dumps(row._asdict(), indent=2, ensure_ascii=False))
+        return 0
+    finally:
+        profiler.finish(args.profile_report)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Content-addressed snapshot store for career timeline datasets.
+
+A snapshot splits a dataset into blocks: one per career plus one per other
+top-level member such as metadata. Each block is stored once, as minified
+JSON named by its sha256, so near-identical variants share nearly all of
+their storage. A snapshot itself is a small manifest listing block hashes in
+document order. The manifest is also named by the hash of its content, so
+recording an unchanged dataset again costs nothing.
+
+    <store>/objects/ab/abcdef....json   career or top-level block
+    <store>/snapshots/<id>.json         manifest
+    <store>/runs.jsonl                  one line per recorded script run
+
+Restoring rebuilds the document and writes it through timeline_writer, so
+the target's extension picks the format (NDJSON for .ndjson/.jsonl), via a
+temp file and rename.
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Any, Optional
+
+from instrumentation import profiler
+from timeline_io import DEFAULT_DATA_PATH, encode_mapping, load_dataset
+from timeline_writer import write_dataset
+from timeline_stream import iter_members
+
+STORE_VERSION = 1
+CAREER_CONTAINER = 'career_timelines'
+
+
+def default_store_dir(file_path: str) -> str:
+    """The store shared by every dataset in the same directory."""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), '.snapshots')
+
+
+def canonical(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=encode_mapping).encode('utf-8')
+
+
+class SnapshotStore:
+    """Block and manifest storage rooted at one directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._blocks: Dict[str, Any] = {}
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'objects', digest[:2], digest + '.json')
+
+    def _manifest_path(self, snapshot_id: str) -> str:
+        return os.path.join(self.root, 'snapshots', snapshot_id + '.json')
+
+    def _write_once(self, path: str, payload: bytes) -> None:
+        """Atomically create path unless it already exists (content addressing makes it identical)."""
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def put_block(self, value: Any) -> str:
+        payload = canonical(value)
+        digest = hashlib.sha256(payload).hexdigest()
+        self._write_once(self._object_path(digest), payload)
+        return digest
+
+    def get_block(self, digest: str) -> Any:
+        if digest not in self._blocks:
+            with open(self._object_path(digest), 'rb') as f:
+                self._blocks[digest] = json.loads(f.read().decode('utf-8'))
+        return self._blocks[digest]
+
+    def snapshot(self, data: Dict[str, Any], label: str = '') -> str:
+        """Store a dataset and return its snapshot id."""
+        members = []
+        for key, value in data.items():
+            if key == CAREER_CONTAINER and isinstance(value, dict):
+                members.append([key, None])
+            else:
+                members.append([key, self.put_block(value)])
+        careers = [[key, self.put_block(career)] for key, career in data.get(CAREER_CONTAINER, {}).items()]
+        return self._save_manifest(members, careers, label)
+
+    def snapshot_file(self, file_path: str, label: str = '') -> str:
+        """Store a dataset file one career at a time; same id as snapshot() of the parsed file."""
+        members = []
+        careers = []
+        for key, value in iter_members(file_path):
+            if key == CAREER_CONTAINER:
+                members.append([key, None])
+                careers = [[career_key, self.put_block(career)] for career_key, career in value]
+            else:
+                members.append([key, self.put_block(value)])
+        return self._save_manifest(members, careers, label)
+
+    def _save_manifest(self, members: List[List[Any]], careers: List[List[Any]], label: str) -> str:
+        content = {'version': STORE_VERSION, 'members': members, 'careers': careers}
+        snapshot_id = hashlib.sha256(canonical(content)).hexdigest()[:20]
+        manifest = dict(content, id=snapshot_id, created=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                        label=label)
+        self._write_once(self._manifest_path(snapshot_id), json.dumps(manifest, indent=1).encode('utf-8'))
+        return snapshot_id
+
+    def manifest(self, snapshot_id: str) -> Dict[str, Any]:
+        path = self._manifest_path(snapshot_id)
+        if not os.path.exists(path):
+            matches = [s for s in self.snapshot_ids() if s.startswith(snapshot_id)]
+            if len(matches) != 1:
+                raise KeyError(f"{'ambiguous' if matches else 'unknown'} snapshot {snapshot_id!r}")
+            path = self._manifest_path(matches[0])
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def snapshot_ids(self) -> List[str]:
+        directory = os.path.join(self.root, 'snapshots')
+        if not os.path.isdir(directory):
+            return []
+        return [name[:-len('.json')] for name in os.listdir(directory) if name.endswith('.json')]
+
+    def load(self, snapshot_id: str) -> Dict[str, Any]:
+        """Rebuild the dataset recorded by a snapshot."""
+        manifest = self.manifest(snapshot_id)
+        data = {}
+        for key, digest in manifest['members']:
+            if digest is None:
+                data[key] = {career_key: self.get_block(d) for career_key, d in manifest['careers']}
+            else:
+                data[key] = self.get_block(digest)
+        return data
+
+    def restore(self, snapshot_id: str, file_path: str) -> None:
+        """Atomically overwrite file_path with the snapshot's dataset, in the format its extension implies."""
+        write_dataset(self.load(snapshot_id), file_path)
+
+    def diff(self, old_id: str, new_id: str) -> Dict[str, Dict[str, List[str]]]:
+        """Careers and top-level members that differ between two snapshots, by comparing hashes."""
+        old, new = self.manifest(old_id), self.manifest(new_id)
+        result = {}
+        for section in ('careers', 'members'):
+            before, after = dict(old[section]), dict(new[section])
+            result[section] = {
+                'added': [key for key in after if key not in before],
+                'removed': [key for key in before if key not in after],
+                'changed': [key for key in after if key in before and before[key] != after[key]]
+            }
+        return result
+
+    def block_patch(self, old_id: str, new_id: str, career_key: str) -> str:
+        """Unified diff of one career between two snapshots."""
+        texts = []
+        for snapshot_id in (old_id, new_id):
+            digest = dict(self.manifest(snapshot_id)['careers']).get(career_key)
+            value = self.get_block(digest) if digest else None
+            texts.append(json.dumps(value, indent=2, ensure_ascii=False).splitlines(keepends=True)
+                         if value is not None else [])
+        return ''.join(difflib.unified_diff(texts[0], texts[1], f"{old_id}/{career_key}", f"{new_id}/{career_key}"))
+
+    def record_run(self, script: str, source: str, input_id: str, output_id: str) -> None:
+        """Append one line describing a script run to the run log."""
+        os.makedirs(self.root, exist_ok=True)
+        entry = {'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), 'script': script,
+                 'source': os.path.basename(source), 'input': input_id, 'output': output_id}
+        with open(os.path.join(self.root, 'runs.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def runs(self) -> List[Dict[str, Any]]:
+        path = os.path.join(self.root, 'runs.jsonl')
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+class RunSnapshots:
+    """Records the input and output of one script run in the dataset's store."""
+
+    def __init__(self, script: str, file_path: str, enabled: bool = True):
+        self.script = script
+        self.store = SnapshotStore(default_store_dir(file_path)) if enabled else None
+        self.input_id = None
+
+    @classmethod
+    def for_output(cls, script: str, input_path: str, output_path: str, enabled: bool = True) -> 'RunSnapshots':
+        """Snapshots for a run writing output_path; only recorded when that overwrites input_path."""
+        overwrites = os.path.exists(output_path) and os.path.samefile(input_path, output_path)
+        return cls(script, input_path, enabled and overwrites)
+
+    def before(self, input_path: str) -> None:
+        """Snapshot the input file as it is on disk.
+
+        Call it just before the output is written, so runs that end up
+        writing nothing pay nothing for snapshots.
+        """
+        if self.store:
+            with profiler.phase('snapshot'):
+                self.input_id = self.store.snapshot_file(input_path, f"{self.script} input")
+
+    def after(self, data: Dict[str, Any], output_path: str) -> None:
+        """Snapshot the dataset as written and log the run."""
+        if self.store:
+            with profiler.phase('snapshot'):
+                output_id = self.store.snapshot(data, f"{self.script} output")
+                self.store.record_run(self.script, output_path, self.input_id, output_id)
+
+    def after_file(self, output_path: str) -> None:
+        """Like after(), for runs that streamed their output instead of holding the dataset."""
+        if self.store:
+            with profiler.phase('snapshot'):
+                output_id = self.store.snapshot_file(output_path, f"{self.script} output")
+                self.store.record_run(self.script, output_path, self.input_id, output_id)
+
+
+def add_snapshot_argument(parser) -> None:
+    """Add the shared `--no-snapshot` flag to a script's argument parser."""
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='do not record input/output snapshots in the .snapshots store')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Take, list, diff and restore dataset snapshots."""
+    parser = argparse.ArgumentParser(description='Content-addressed snapshots of career timeline datasets.')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH,
+                        help='dataset file; taken or restored by default, and its directory holds the store')
+    parser.add_argument('--store', help='snapshot store directory (default: .snapshots next to the dataset)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    take = sub.add_parser('take', help='snapshot the dataset file')
+    take.add_argument('-m', '--label', default='', help='free-form description stored in the manifest')
+    sub.add_parser('list', help='list snapshots, oldest first')
+    sub.add_parser('runs', help='show the script run log')
+    diff = sub.add_parser('diff', help='compare two snapshots')
+    diff.add_argument('old')
+    diff.add_argument('new')
+    diff.add_argument('--patch', action='store_true', help='print a unified diff of each changed career')
+    restore = sub.add_parser('restore', help='write a snapshot back to the dataset file')
+    restore.add_argument('snapshot')
+    restore.add_argument('-o', '--output', help='write here instead of the dataset file')
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.store or default_store_dir(args.data))
+    try:
+        return run(store, args)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+
+def run(store: SnapshotStore, args: argparse.Namespace) -> int:
+    """Carry out one parsed snapshot command."""
+    if args.command == 'take':
+        snapshot_id = store.snapshot(load_dataset(args.data), args.label)
+        print(snapshot_id)
+    elif args.command == 'list':
+        manifests = sorted((store.manifest(s) for s in store.snapshot_ids()), key=lambda m: m['created'])
+        for manifest in manifests:
+            print(f"{manifest['id']}  {manifest['created']}  {len(manifest['careers'])} careers  {manifest['label']}")
+    elif args.command == 'runs':
+        for entry in store.runs():
+            print(f"{entry['time']}  {entry['script']:<16} {entry['source']}  {entry['input']} -> {entry['output']}")
+    elif args.command == 'diff':
+        result = store.diff(args.old, args.new)
+        for section, changes in result.items():
+            for change, keys in changes.items():
+                for key in keys:
+                    print(f"{change:<8} {'career' if section == 'careers' else 'member'} {key}")
+        if args.patch:
+            old_id, new_id = store.manifest(args.old)['id'], store.manifest(args.new)['id']
+            for key in result['careers']['changed']:
+                sys.stdout.write(store.block_patch(old_id, new_id, key))
+    else:
+        output = args.output or args.data
+        store.restore(args.snapshot, output)
+        print(f"Restored {store.manifest(args.snapshot)['id']} to {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Synthetic career timeline datasets for benchmarking the pivot tooling.
+
+Generates files with the same shape as careerTimelineData_PhDOptimized.json
+(metadata plus career_timelines, every career and stage field the real data
+carries) at arbitrary sizes. Datasets are seeded and therefore reproducible.
+They vary main_path length, pivot count and branchFromIndex. A configurable
+share of stage salaries are the awkward or malformed strings seen in (or
+plausible for) hand-edited data.
+"""
+
+import argparse
+import json
+import os
+import random
+from typing import Dict, List, Any, Optional
+
+GENERATOR_VERSION = 2
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_MALFORMED_RATE = 0.03
+
+LEVELS = ['entry', 'mid', 'senior', 'lead', 'exec']
+COLORS = ["#DC2626", "#7C3AED", "#F59E0B", "#059669"]
+INDUSTRIES = ['Tech', 'Biotech', 'Pharma', 'Finance', 'Healthcare', 'Consulting', 'Energy',
+              'Government', 'Manufacturing', 'Media', 'Education', 'Nonprofit']
+COMPANIES = ['Google', 'Meta', 'Moderna', 'Genentech', 'McKinsey', 'Pfizer', 'Netflix',
+             'Deloitte', 'Tesla', 'IBM', 'Novartis', 'Goldman Sachs']
+
+# Career families cover every categorize_career() bucket and the restore_pivots
+# key lists; the first occurrence of each family uses the real career key.
+CAREER_FAMILIES = [
+    ('data_scientist', 'Data Scientist', 'DS'),
+    ('software_engineering', 'Software Engineer', 'SWE'),
+    ('ai_ml_engineer', 'AI/ML Engineer', 'ML Eng'),
+    ('cybersecurity_analyst', 'Cybersecurity Analyst', 'Security'),
+    ('research_scientist', 'Research Scientist', 'RS'),
+    ('biostatistician', 'Biostatistician', 'Biostat'),
+    ('clinical_research_associate', 'Clinical Research Associate', 'CRA'),
+    ('materials_scientist', 'Materials Scientist', 'Materials'),
+    ('product_manager', 'Product Manager', 'PM'),
+    ('management_consultant', 'Management Consultant', 'Consultant'),
+    ('financial_analyst', 'Financial Analyst', 'FA'),
+    ('regulatory_affairs_specialist', 'Regulatory Affairs Specialist', 'RA'),
+    ('science_policy_advisor', 'Science Policy Advisor', 'Policy'),
+    ('technical_writer', 'Technical Writer', 'Writer'),
+]
+TITLE_PREFIXES = ['', 'Senior ', 'Staff ', 'Principal ', 'Director of ', 'VP ', 'Chief ']
+BRANCH_NAMES = ['ML Engineering', 'Academic Collaboration', 'Product Management', 'Consulting',
+                'Technical Leadership', 'Research Management', 'Entrepreneurship', 'Policy']
+
+# Salary strings that parse_salary_range() accepts but that are easy to get wrong
+ODD_SALARIES = ['$400k-$2M+*', '$0-$150k*', '$1.5M-$3M']
+# Salary strings that are wrong as data. parse_salary_range() rejects most of them;
+# some ('150-200k', '$120k-$90k') parse into wrong or inverted ranges instead.
+MALFORMED_SALARIES = ['Competitive', '', 'TBD', '$150k to $200k', '150-200k', '$200k -', 'k-k',
+                      '$-$', '$120k-$90k', '180000-240000', '$1,200k-$1,500k', '$200K-$300K', '$250k+']
+
+
+def random_salary(rng: random.Random, step: int, malformed_rate: float) -> str:
+    if rng.random() < malformed_rate:
+        return rng.choice(MALFORMED_SALARIES + ODD_SALARIES)
+    low = 80 + step * rng.randint(30, 70)
+    return f"${low}k-${low + rng.randint(20, 120)}k"
+
+
+def random_stages(rng: random.Random, title: str, short: str, count: int, start_level: int,
+                  start_years: float, malformed_rate: float, main_path: bool) -> List[Dict[str, Any]]:
+    stages = []
+    years = start_years
+    for i in range(count):
+        time_to_next = rng.choice([1, 1.5, 2, 2.5, 3, 4]) if i < count - 1 else None
+        prefix = TITLE_PREFIXES[min(i, len(TITLE_PREFIXES) - 1)]
+        stage = {
+            'title': f"{prefix}{title}",
+            'shortTitle': f"{prefix.split(' ')[0][:3]} {short}".strip(),
+            'level': LEVELS[min(start_level + i, len(LEVELS) - 1)],
+            'cumulativeYears': years,
+            'salary': random_salary(rng, start_level + i, malformed_rate),
+            'timeToNext': time_to_next
+        }
+        if main_path:
+            if i == 0:
+                stage['typicalPhDEntry'] = True
+            if time_to_next is not None:
+                stage['phdAccelerated'] = True
+                stage['phdTimeToNext'] = time_to_next
+            if i == 0:
+                stage['phdRecommended'] = rng.random() < 0.7
+                stage['industryDemand'] = rng.choice(['High', 'Very High', 'Medium'])
+        stage['remoteFriendly'] = rng.random() < 0.6
+        stages.append(stage)
+        years = years + (time_to_next or 0)
+    return stages
+
+
+def generate_career(rng: random.Random, index: int, malformed_rate: float):
+    """(career_key, career_data) for the index-th synthetic career."""
+    family_key, title, short = CAREER_FAMILIES[index % len(CAREER_FAMILIES)]
+    generation = index // len(CAREER_FAMILIES)
+    career_key = family_key if generation == 0 else f"{family_key}_{generation}"
+
+    main_path = random_stages(rng, title, short, rng.randint(2, 7), rng.randint(0, 2), 0,
+                              malformed_rate, main_path=True)
+    pivots = []
+    for p in range(rng.choice([0, 1, 2, 2, 3, 3, 4, 4, 4, 5])):
+        branch_from = rng.randrange(len(main_path))
+        branch_name = rng.choice(BRANCH_NAMES)
+        anchor = main_path[branch_from]
+        pivots.append({
+            'branchFromIndex': branch_from,
+            'branchName': branch_name,
+            'color': COLORS[p % len(COLORS)],
+            'transitionSuccess': f"{rng.randrange(50, 95, 5)}%",
+            'stages': random_stages(rng, branch_name.split()[0], branch_name.split()[0][:6],
+                                    rng.randint(1, 4), LEVELS.index(anchor['level']),
+                                    anchor['cumulativeYears'] + rng.choice([1, 1.5, 2]),
+                                    malformed_rate, main_path=False)
+        })
+
+    career_data = {
+        'name': title if generation == 0 else f"{title} {generation}",
+        'targetIndustries': rng.sample(INDUSTRIES, rng.randint(1, 5)),
+        'phdFriendlyCompanies': rng.sample(COMPANIES, rng.randint(2, 6)),
+        'main_path': main_path,
+        'pivot_opportunities': pivots,
+        'phdAdvantages': [f"Research strength {i + 1}" for i in range(rng.randint(2, 4))],
+        'phdTransitionTips': [f"Frame thesis work as project {i + 1}" for i in range(rng.randint(2, 4))],
+        'academicBridge': {
+            'postdocTransition': [
+                {'role': 'Industry Postdoc', 'duration': '1-2 years', 'salary': '$75k-$95k'},
+                {'role': title, 'transitionProbability': f"{rng.randrange(50, 95, 5)}%"}
+            ]
+        },
+        'compensationNotes': {
+            'equityRange': '0.01-0.15%',
+            'bonusStructure': '10-20% base salary',
+            'phdNegotiationTip': 'Emphasize publication record'
+        }
+    }
+    return career_key, career_data
+
+
+def generate_dataset(career_count: int, seed: int = 0, malformed_rate: float = DEFAULT_MALFORMED_RATE) -> Dict[str, Any]:
+    """A complete synthetic dataset with career_count careers."""
+    rng = random.Random(f"{seed}:{career_count}")
+    careers = dict(generate_career(rng, i, malformed_rate) for i in range(career_count))
+    return {
+        'metadata': {
+            'version': '2.0',
+            'description': f"Synthetic career timeline dataset ({career_count} careers)",
+            'created': '2025-08-30',
+            'lastUpdated': '2025-08-31',
+            'scope': f"seed {seed}, malformed salary rate {malformed_rate}",
+            'changeLog': [f"Generated by synth_timelines.py v{GENERATOR_VERSION}"]
+        },
+        'career_timelines': careers
+    }
+
+
+def dataset_path(out_dir: str, career_count: int, seed: int = 0) -> str:
+    return os.path.join(out_dir, f"synthetic-{career_count}-s{seed}-v{GENERATOR_VERSION}.json")
+
+
+def write_dataset(out_dir: str, career_count: int, seed: int = 0,
+                  malformed_rate: float = DEFAULT_MALFORMED_RATE, overwrite: bool = False) -> str:
+    """Write (or reuse) a synthetic dataset file and return its path."""
+    path = dataset_path(out_dir, career_count, seed)
+    if os.path.exists(path) and not overwrite:
+        return path
+    os.makedirs(out_dir, exist_ok=True)
+    data = generate_dataset(career_count, seed, malformed_rate)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main(argv: Optional[List[str]] = None):
+    """Write synthetic datasets of the requested sizes."""
+    parser = argparse.ArgumentParser(description='Generate synthetic career timeline datasets.')
+    parser.add_argument('sizes', nargs='*', type=int, default=list(DEFAULT_SIZES), help='career counts')
+    parser.add_argument('-o', '--out-dir', default='.', help='output directory')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--malformed-rate', type=float, default=DEFAULT_MALFORMED_RATE,
+                        help='share of stage salaries replaced by odd or malformed strings')
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        path = write_dataset(args.out_dir, size, args.seed, args.malformed_rate, overwrite=True)
+        print(f"{path}: {size} careers, {os.path.getsize(path) / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
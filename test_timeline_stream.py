@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the shared JSON member walker (timeline_stream.JsonReader)
+and the span-based block rewriting built on it (timeline_blocks.py).
+
+Run with `python -m pytest test_timeline_stream.py` or directly.
+"""
+
+import json
+import os
+import random
+import tempfile
+
+import synth_timelines
+from timeline_blocks import dump_block, load_with_career_spans, splice
+from timeline_stream import iter_members
+
+AWKWARD_STRINGS = ['', 'é→✓ 💼', 'quote " and \\ backslash', '\\u escapes \u0000\u001f', '{"not": "json"}',
+                   ', : } ] [', ' ' * 40]
+AWKWARD_NUMBERS = [0, -1, 12345678901234567890, 1.5e-7, -0.0, 3.14159265358979, 1e300]
+
+
+def fuzz_dataset(rng: random.Random):
+    """A small synthetic dataset with strings and numbers that stress token boundaries."""
+    data = synth_timelines.generate_dataset(rng.randint(0, 12), seed=rng.randrange(1000))
+    data['metadata']['awkward'] = [rng.choice(AWKWARD_STRINGS + AWKWARD_NUMBERS) for _ in range(rng.randint(0, 8))]
+    for career in data['career_timelines'].values():
+        career[rng.choice(AWKWARD_STRINGS)] = rng.choice(AWKWARD_NUMBERS)
+        for stage in career['main_path']:
+            stage['cumulativeYears'] = rng.choice(AWKWARD_NUMBERS)
+    data['career_timelines'][rng.choice(AWKWARD_STRINGS)] = {}
+    data['trailer'] = rng.choice(AWKWARD_NUMBERS)
+    return data
+
+
+def encodings(data):
+    yield json.dumps(data, indent=2, ensure_ascii=False)
+    yield json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    yield json.dumps(data)
+
+
+def read_members(file_path: str, chunk_size: int):
+    return {key: dict(value) if key == 'career_timelines' else value
+            for key, value in iter_members(file_path, chunk_size)}
+
+
+def test_iter_members_is_chunk_size_independent():
+    rng = random.Random(20260417)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'fuzz.json')
+        for _ in range(25):
+            data = fuzz_dataset(rng)
+            for text in encodings(data):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                expected = json.loads(text)
+                for chunk_size in [1, 2, 3, 7, 16, rng.randint(1, 4096), 1 << 16]:
+                    assert read_members(path, chunk_size) == expected, chunk_size
+
+
+def test_career_spans_cover_exact_blocks():
+    rng = random.Random(7)
+    for _ in range(25):
+        for text in encodings(fuzz_dataset(rng)):
+            data, top_spans, career_spans = load_with_career_spans(text)
+            assert data == json.loads(text)
+            for key, (start, end) in top_spans.items():
+                assert json.loads(text[start:end]) == data[key]
+            for key, (start, end) in career_spans.items():
+                assert json.loads(text[start:end]) == data['career_timelines'][key]
+            replacements = [(span, text[span[0]:span[1]]) for span in career_spans.values()]
+            assert splice(text, replacements) == text
+
+
+def test_splice_is_byte_identical_to_full_dump():
+    rng = random.Random(11)
+    for _ in range(25):
+        data = fuzz_dataset(rng)
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+        _, _, career_spans = load_with_career_spans(text)
+        replacements = []
+        for key, career in data['career_timelines'].items():
+            career['pivot_opportunities'] = [{'branchName': rng.choice(AWKWARD_STRINGS)}]
+            replacements.append((career_spans[key], dump_block(career, 2)))
+        assert splice(text, replacements) == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"{name}: ok")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Regression checks for in-place writes of NDJSON datasets (timeline_writer.py):
+restore_pivots and enhance_pivots must keep the layout the file name implies.
+
+Run with `python -m pytest test_timeline_writer.py` or directly.
+"""
+
+import json
+import os
+import tempfile
+
+import enhance_pivots
+import restore_pivots
+import synth_timelines
+from timeline_io import dump_dataset, load_dataset, write_text
+from timeline_stream import ndjson_header_path
+from timeline_writer import write_dataset
+
+
+def run_in_place(script, file_name: str):
+    """Run script on a synthetic dataset saved as pretty JSON and as NDJSON; return both results."""
+    data = synth_timelines.generate_dataset(40, seed=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'timelines.json')
+        ndjson_path = os.path.join(tmp, file_name)
+        write_text(dump_dataset(data), json_path)
+        write_dataset(data, ndjson_path)
+        for path in (json_path, ndjson_path):
+            script.main([path, '--no-snapshot'])
+        with open(ndjson_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        with open(ndjson_header_path(ndjson_path), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        return load_dataset(json_path), load_dataset(ndjson_path), lines, header
+
+
+def check_ndjson_round_trip(script, file_name: str):
+    expected, actual, lines, header = run_in_place(script, file_name)
+    assert actual == expected
+    assert len(lines) == len(expected['career_timelines'])
+    for line, career_key in zip(lines, expected['career_timelines']):
+        assert list(json.loads(line)) == [career_key]
+    assert header['metadata'] == expected['metadata']
+    assert header['career_timelines'] is None
+
+
+def test_restore_in_place_keeps_ndjson():
+    check_ndjson_round_trip(restore_pivots, 'timelines.ndjson')
+
+
+def test_enhance_in_place_keeps_ndjson():
+    check_ndjson_round_trip(enhance_pivots, 'timelines.jsonl')
+
+
+def test_enhance_incremental_refuses_ndjson():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'timelines.ndjson')
+        write_dataset(synth_timelines.generate_dataset(3, seed=1), path)
+        with open(path, 'rb') as f:
+            before = f.read()
+        try:
+            enhance_pivots.main([path, '--incremental', '--no-snapshot'])
+        except SystemExit as e:
+            assert e.code == 2
+        else:
+            raise AssertionError('--incremental on NDJSON was accepted')
+        with open(path, 'rb') as f:
+            assert f.read() == before
+
+
+if __name__ == '__main__':
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"{name}: ok")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Helpers for locating and rewriting individual career blocks inside a
+career timeline JSON file without re-serializing the whole document.
+"""
+
+import json
+from typing import Dict, List, Any, Tuple
+
+from timeline_io import encode_mapping
+from timeline_stream import JsonReader, Span
+
+
+def decode_object_with_spans(text: str, idx: int = 0) -> Tuple[Dict[str, Any], Dict[str, Span], int]:
+    """Decode the JSON object at idx, recording the text span of every member value."""
+    reader = JsonReader.from_text(text, idx)
+    result: Dict[str, Any] = {}
+    spans: Dict[str, Span] = {}
+    for key in reader.members():
+        result[key], spans[key] = reader.value_span()
+    return result, spans, reader.offset
+
+
+def load_with_career_spans(text: str) -> Tuple[Dict[str, Any], Dict[str, Span], Dict[str, Span]]:
+    """Decode a timeline document, returning (data, top-level spans, career spans)."""
+    reader = JsonReader.from_text(text)
+    data: Dict[str, Any] = {}
+    top_spans: Dict[str, Span] = {}
+    career_spans: Dict[str, Span] = {}
+    for key in reader.members():
+        if key == 'career_timelines':
+            reader.skip_ws()
+            start = reader.offset
+            careers = data[key] = {}
+            for career_key in reader.members():
+                careers[career_key], career_spans[career_key] = reader.value_span()
+            top_spans[key] = (start, reader.offset)
+        else:
+            data[key], top_spans[key] = reader.value_span()
+    return data, top_spans, career_spans
+
+
+def dump_block(value: Any, depth: int) -> str:
+    """Serialize a value the way json.dump(indent=2) would at the given nesting depth."""
+    text = json.dumps(value, indent=2, ensure_ascii=False, default=encode_mapping)
+    return text.replace('\n', '\n' + '  ' * depth)
+
+
+def splice(text: str, replacements: List[Tuple[Span, str]]) -> str:
+    """Replace the given spans of text, leaving everything else byte-for-byte intact."""
+    parts = []
+    pos = 0
+    for (start, end), new_text in sorted(replacements, key=lambda r: r[0][0]):
+        parts.append(text[pos:start])
+        parts.append(new_text)
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+One entry point for the dataset maintenance steps.
+
+Steps run in the order given over a single in-memory copy of the dataset, so
+the file is parsed once and, if any step changed it, serialized once at the
+end:
+
+    python timeline_cli.py restore enhance count
+    python timeline_cli.py -i data/x.json -o /tmp/y.json enhance --rules r.json validate export /tmp/y.sqlite
+
+Options placed before the first step apply to the whole pipeline; options after
+a step name belong to that step. Each step imports its implementation only
+when it runs, so a plain `count` does not pay for SQLite or the pivot rules.
+With --compact the dataset is held in the slotted model of timeline_model.py,
+which every step operates on directly. Inputs and outputs ending in .ndjson or
+.jsonl use the NDJSON layout of timeline_writer.py, and --format picks the
+layout of written files explicitly.
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Any, Optional
+
+from instrumentation import add_profile_argument, profiler
+from timeline_io import DEFAULT_DATA_PATH, dump_dataset, load_dataset, write_text
+from timeline_stream import is_ndjson
+from timeline_writer import FORMATS, format_for_path, write_dataset
+
+
+# Steps that can change the dataset; only pipelines containing one record snapshots
+MODIFYING_STEPS = ('restore', 'enhance')
+
+
+class StepFailed(Exception):
+    """A step found a problem that should stop the pipeline before anything is written."""
+
+
+class Pipeline:
+    """The dataset shared by every step of one invocation."""
+
+    def __init__(self, input_path: str, snapshots=None, compact: bool = False, fmt: Optional[str] = None):
+        self.input_path = input_path
+        self.snapshots = snapshots
+        self.compact = compact
+        self.fmt = fmt
+        self.modified = False
+        self._data = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            with profiler.phase('load'):
+                if self.compact:
+                    from timeline_model import load_model
+                    self._data = load_model(self.input_path)
+                else:
+                    self._data = load_dataset(self.input_path)
+        return self._data
+
+    @property
+    def careers(self) -> Dict[str, Any]:
+        return self.data['career_timelines']
+
+    def dump(self) -> str:
+        """The dataset in the data files' format."""
+        if self.compact:
+            from timeline_model import dump_model
+            return dump_model(self.data)
+        return dump_dataset(self.data)
+
+    def write(self, output_path: str) -> None:
+        """Write the dataset in --format, or the layout its file name implies."""
+        if self.fmt or is_ndjson(output_path):
+            with profiler.phase('write'):
+                write_dataset(self.data, output_path, self.fmt)
+            return
+        with profiler.phase('serialize'):
+            text = self.dump()
+        with profiler.phase('write'):
+            write_text(text, output_path)
+
+    def save(self, output_path: str) -> None:
+        if self.snapshots:
+            self.snapshots.before(self.input_path)
+        self.write(output_path)
+        if self.snapshots:
+            self.snapshots.after(self.data, output_path)
+
+
+def run_count(pipeline: Pipeline, args: argparse.Namespace) -> None:
+    from count_pivots import count_pivots_in
+    count_pivots_in(pipeline.careers)
+
+
+def run_restore(pipeline: Pipeline, args: argparse.Namespace) -> None:
+    from restore_pivots import print_summary, restore_all_pivots
+    career_stats = restore_all_pivots(pipeline.careers, args.workers)
+    print_summary(career_stats)
+    pipeline.modified = pipeline.modified or any(s['restored'] for s in career_stats.values())
+
+
+def run_enhance(pipeline: Pipeline, args: argparse.Namespace) -> None:
+    from enhance_pivots import apply_plan, install_pivots, print_dry_run, print_pivot_totals
+    from pivot_rules import PIVOT_RULES_PATH, load_plan
+    careers = pipeline.careers
+    new_pivots = apply_plan(careers, load_plan(args.rules or PIVOT_RULES_PATH))
+    if args.dry_run:
+        changed = print_dry_run(careers, new_pivots)
+        print(f"Would change pivot opportunities for {changed} of {len(careers)} careers")
+        return
+    install_pivots(pipeline.data, new_pivots)
+    print_pivot_totals(careers)
+    pipeline.modified = True
+
+
+def run_validate(pipeline: Pipeline, args: argparse.Namespace) -> None:
+    from validate_timelines import validate_timelines
+    violations = validate_timelines(pipeline.careers, args.workers, args.fail_fast)
+    for violation in violations:
+        print(violation.as_json())
+    print(f"Validation violations: {len(violations)}")
+    if violations and args.strict:
+        raise StepFailed(f"validate found {len(violations)} violations")
+
+
+def is_sqlite(path: str) -> bool:
+    return os.path.splitext(path)[1] in ('.sqlite', '.db')
+
+
+def run_export(pipeline: Pipeline, args: argparse.Namespace) -> None:
+    if is_sqlite(args.destination):
+        from export_sqlite import export_documents
+        document = pipeline.data.to_json() if pipeline.compact else pipeline.data
+        export_documents([(os.path.basename(pipeline.input_path), document)], args.destination)
+    else:
+        pipeline.write(args.destination)
+    print(f"Exported dataset to {args.destination}")
+
+
+def step_parsers() -> Dict[str, argparse.ArgumentParser]:
+    """Argument parser for each step, keyed by step name."""
+    parsers = {}
+
+    parsers['count'] = argparse.ArgumentParser(prog='count', description='report pivot counts per career')
+    parsers['count'].set_defaults(run=run_count)
+
+    parsers['restore'] = argparse.ArgumentParser(prog='restore', description='add missing branchFromIndex 2/3 pivots')
+    parsers['restore'].add_argument('--workers', type=int, help='worker processes for large datasets')
+    parsers['restore'].set_defaults(run=run_restore)
+
+    parsers['enhance'] = argparse.ArgumentParser(prog='enhance', description='regenerate pivots from the rule file')
+    parsers['enhance'].add_argument('--rules', help='pivot rule file (default: pivot_rules.json)')
+    parsers['enhance'].add_argument('--dry-run', action='store_true', help='print the pivot diff without applying it')
+    parsers['enhance'].set_defaults(run=run_enhance)
+
+    parsers['validate'] = argparse.ArgumentParser(prog='validate', description='check timeline invariants')
+    parsers['validate'].add_argument('--strict', action='store_true', help='stop the pipeline if any violation is found')
+    parsers['validate'].add_argument('--fail-fast', action='store_true', help='stop at the first career with a violation')
+    parsers['validate'].add_argument('--workers', type=int, help='worker processes for large datasets')
+    parsers['validate'].set_defaults(run=run_validate)
+
+    parsers['export'] = argparse.ArgumentParser(prog='export', description='write the current dataset elsewhere')
+    parsers['export'].add_argument('destination', help='.sqlite/.db for an indexed database, otherwise JSON')
+    parsers['export'].set_defaults(run=run_export)
+
+    return parsers
+
+
+def split_steps(argv: List[str], step_names) -> List[List[str]]:
+    """Split argv into the global arguments followed by one argument list per step."""
+    groups = [[]]
+    for token in argv:
+        if token in step_names:
+            groups.append([token])
+        else:
+            groups[-1].append(token)
+    return groups
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse the pipeline, run its steps and write the result once."""
+    argv = sys.argv[1:] if argv is None else argv
+    steps = step_parsers()
+    parser = argparse.ArgumentParser(
+        description='Run dataset steps over one in-memory copy of a career timeline file.',
+        epilog=f"steps: {', '.join(steps)}. Use '<step> -h' for step options."
+    )
+    parser.add_argument('-i', '--input', default=DEFAULT_DATA_PATH, help='career timeline JSON file')
+    parser.add_argument('-o', '--output', help='where to write a modified dataset (default: the input file)')
+    parser.add_argument('-n', '--no-write', action='store_true', help='never write the modified dataset')
+    add_profile_argument(parser, 'timeline_cli')
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='do not record input/output snapshots when the dataset is written')
+    parser.add_argument('--compact', action='store_true',
+                        help='hold the dataset in the compact slotted model (much less memory, slower to load)')
+    parser.add_argument('--format', choices=FORMATS,
+                        help='layout of written files (default: ndjson for .ndjson/.jsonl, else pretty)')
+
+    global_args, *step_argvs = split_steps(argv, steps)
+    args = parser.parse_args(global_args)
+    if not step_argvs:
+        parser.error('no steps given')
+    plan = [steps[name].parse_args(rest) for name, *rest in step_argvs]
+    # Refuse layouts the readers would misread before any step runs
+    targets = [] if args.no_write else [args.output or args.input]
+    targets += [step_args.destination for step_args in plan
+                if step_args.run is run_export and not is_sqlite(step_args.destination)]
+    for target in targets:
+        try:
+            format_for_path(target, args.format)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.profile:
+        profiler.start('timeline_cli')
+    try:
+        snapshots = None
+        if not (args.no_snapshot or args.no_write) and any(name in MODIFYING_STEPS for name, *_ in step_argvs):
+            from snapshot_store import RunSnapshots
+            snapshots = RunSnapshots('timeline_cli', args.output or args.input)
+        pipeline = Pipeline(args.input, snapshots, args.compact, args.format)
+        for (name, *_), step_args in zip(step_argvs, plan):
+            if len(plan) > 1:
+                print(f"=== {name} ===")
+            with profiler.phase(f"step {name}"):
+                step_args.run(pipeline, step_args)
+        if pipeline.modified and not args.no_write:
+            output = args.output or args.input
+            pipeline.save(output)
+            print(f"Saved {output}")
+    except StepFailed as e:
+        print(f"Stopped: {e}; nothing was written", file=sys.stderr)
+        return 1
+    finally:
+        profiler.finish(args.profile_report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Columnar view of a career timeline dataset.
+
+Every stage of every main_path and pivot_opportunities entry becomes one row in
+a set of typed, contiguous arrays, so salary and timeline statistics can be
+computed without re-walking (and re-parsing) the nested JSON. Columns are
+stdlib array.array buffers; as_numpy() exposes them as zero-copy NumPy arrays
+when NumPy is installed.
+"""
+
+import math
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Any, NamedTuple
+
+from salary_ranges import SalaryParseError, parse_salary_range
+from timeline_io import DEFAULT_DATA_PATH, load_dataset
+
+LEVELS = ['entry', 'mid', 'senior', 'lead', 'exec']
+LEVEL_CODES = {level: code for code, level in enumerate(LEVELS)}
+UNKNOWN_LEVEL = -1
+
+MAIN_PATH = -1  # path_id of main_path rows; pivot rows use their pivot index
+MISSING = -1    # salary_min/salary_max of unparseable salaries
+
+
+class ParseIssue(NamedTuple):
+    """A stage value that could not be converted into a column."""
+    career_key: str
+    path_id: int
+    stage_index: int
+    field: str
+    value: Any
+    message: str
+
+
+class TimelineColumns:
+    """Struct-of-arrays table with one row per timeline stage."""
+
+    COLUMNS = ('career_id', 'path_id', 'stage_index', 'level_code', 'cumulative_years',
+               'salary_min', 'salary_max', 'time_to_next', 'remote_friendly')
+
+    def __init__(self):
+        self.career_keys: List[str] = []
+        self.career_id = array('I')
+        self.path_id = array('h')
+        self.stage_index = array('H')
+        self.level_code = array('b')
+        self.cumulative_years = array('d')
+        self.salary_min = array('q')
+        self.salary_max = array('q')
+        self.time_to_next = array('d')
+        self.remote_friendly = array('B')
+        self.issues: List[ParseIssue] = []
+
+    def __len__(self) -> int:
+        return len(self.career_id)
+
+    def _append_stage(self, career_id: int, career_key: str, path_id: int, stage_index: int,
+                      stage: Dict[str, Any]) -> None:
+        level = stage.get('level')
+        code = LEVEL_CODES.get(level, UNKNOWN_LEVEL)
+        if code == UNKNOWN_LEVEL:
+            self.issues.append(ParseIssue(career_key, path_id, stage_index, 'level', level, 'unknown level'))
+
+        salary = stage.get('salary')
+        try:
+            salary_min, salary_max, _ = parse_salary_range(salary)
+        except SalaryParseError as e:
+            salary_min = salary_max = MISSING
+            self.issues.append(ParseIssue(career_key, path_id, stage_index, 'salary', salary, str(e)))
+
+        cumulative_years = self._number(career_key, path_id, stage_index, stage, 'cumulativeYears')
+        time_to_next = self._number(career_key, path_id, stage_index, stage, 'timeToNext')
+        self.career_id.append(career_id)
+        self.path_id.append(path_id)
+        self.stage_index.append(stage_index)
+        self.level_code.append(code)
+        self.cumulative_years.append(cumulative_years)
+        self.salary_min.append(salary_min)
+        self.salary_max.append(salary_max)
+        self.time_to_next.append(time_to_next)
+        self.remote_friendly.append(1 if stage.get('remoteFriendly') else 0)
+
+    def _number(self, career_key: str, path_id: int, stage_index: int, stage: Dict[str, Any], field: str) -> float:
+        """A numeric stage field as a float; NaN (with a ParseIssue) if it is not a number, NaN if absent."""
+        value = stage.get(field)
+        if value is None:
+            return math.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            self.issues.append(ParseIssue(career_key, path_id, stage_index, field, value,
+                                          f"not a number: {value!r}"))
+            return math.nan
+
+    @classmethod
+    def from_timelines(cls, career_timelines: Dict[str, Any]) -> 'TimelineColumns':
+        """Build the columns from a career_timelines mapping in a single pass."""
+        table = cls()
+        for career_id, (career_key, career_data) in enumerate(career_timelines.items()):
+            table.career_keys.append(career_key)
+            for stage_index, stage in enumerate(career_data.get('main_path', [])):
+                table._append_stage(career_id, career_key, MAIN_PATH, stage_index, stage)
+            for pivot_index, pivot in enumerate(career_data.get('pivot_opportunities', [])):
+                for stage_index, stage in enumerate(pivot.get('stages', [])):
+                    table._append_stage(career_id, career_key, pivot_index, stage_index, stage)
+        return table
+
+    def rows_for(self, career_key: str) -> range:
+        """Row range belonging to one career (rows are stored career by career)."""
+        career_id = self.career_keys.index(career_key)
+        return range(bisect_left(self.career_id, career_id), bisect_left(self.career_id, career_id + 1))
+
+    def salary_midpoints(self) -> array:
+        """Midpoint of each stage's salary range, NaN where the salary did not parse."""
+        return array('d', (
+            math.nan if low == MISSING else (low + high) / 2
+            for low, high in zip(self.salary_min, self.salary_max)
+        ))
+
+    def as_numpy(self) -> Dict[str, Any]:
+        """Zero-copy NumPy views of every column (requires NumPy)."""
+        import numpy as np
+
+        columns = {name: np.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode)
+                   for name in self.COLUMNS}
+        columns['remote_friendly'] = columns['remote_friendly'].view(np.bool_)
+        return columns
+
+
+def load_columns(file_path: str = DEFAULT_DATA_PATH) -> TimelineColumns:
+    """Load a career timeline file (JSON or NDJSON) into columns."""
+    data = load_dataset(file_path)
+    return TimelineColumns.from_timelines(data.get('career_timelines', {}))
+
+
+def report_issues(issues: List[ParseIssue], out=sys.stderr) -> None:
+    """Print one line per parse issue."""
+    for issue in issues:
+        path = 'main_path' if issue.path_id == MAIN_PATH else f"pivot_opportunities[{issue.path_id}]"
+        print(f"{issue.career_key}.{path}[{issue.stage_index}].{issue.field}: {issue.message}", file=out)
+
+
+if __name__ == '__main__':
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATA_PATH
+    table = load_columns(file_path)
+    print(f"Careers: {len(table.career_keys)}")
+    print(f"Stages: {len(table)}")
+    print(f"Parse issues: {len(table.issues)}")
+    report_issues(table.issues)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Shared loading and saving of career timeline dataset files.
+
+All scripts read and write the dataset through these helpers so they agree on
+the default location (data/ next to this file) and the on-disk format
+(2-space indented JSON with non-ASCII characters kept as-is). NDJSON datasets
+written by timeline_writer.py load into the same document shape.
+"""
+
+import json
+import os
+from collections.abc import Mapping
+from typing import Dict, Any
+
+from timeline_stream import is_ndjson, iter_members
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_DATA_PATH = os.path.join(DATA_DIR, 'careerTimelineData_PhDOptimized.json')
+
+
+def load_dataset(file_path: str = DEFAULT_DATA_PATH) -> Dict[str, Any]:
+    """Parse a dataset file."""
+    if is_ndjson(file_path):
+        return {key: dict(value) if key == 'career_timelines' else value for key, value in iter_members(file_path)}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def encode_mapping(value: Any) -> Dict[str, Any]:
+    """json `default` hook: serialize non-dict mappings (such as timeline_model records) as objects."""
+    if isinstance(value, Mapping):
+        return dict(value.items())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_dataset(data: Dict[str, Any]) -> str:
+    """Serialize a dataset exactly as the data files are formatted."""
+    return json.dumps(data, indent=2, ensure_ascii=False, default=encode_mapping)
+
+
+def write_text(text: str, file_path: str) -> None:
+    """Write via a temporary file and rename, so readers never see a partial file."""
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, file_path)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory model of a career timeline dataset.
+
+Careers, pivots and stages are held as __slots__ records instead of dicts.
+Title, name, salary and similar strings are interned so repeated values share
+one object, and stage levels are stored as Level enum members. Each record
+keeps the tuple of its JSON keys in document order (one shared tuple per key
+layout) and any keys it has no slot for, so to_json() reproduces the source
+document exactly.
+
+Records are also mutable mappings keyed by the JSON names, so code written
+against the plain dicts (count_pivots, restore_pivots, enhance_pivots,
+validate_timelines) runs on the model unchanged:
+
+    stage['level'] == 'senior'        # JSON view
+    stage.level is Level.SENIOR       # typed view
+
+Dicts assigned to a record or appended to one of its stage/pivot lists are
+converted on the way in. Fields absent from the JSON are unset attributes.
+load_model() builds the model while streaming the file one career at a time,
+and dump_model() serializes it one career at a time, so the plain dicts of the
+whole document are never held at once.
+"""
+
+import json
+import sys
+from operator import attrgetter
+from collections.abc import MutableMapping
+from enum import IntEnum
+from typing import Callable, Dict, List, Any, Iterable, Tuple
+
+from timeline_columns import LEVEL_CODES, LEVELS
+from timeline_blocks import dump_block
+from timeline_io import DEFAULT_DATA_PATH
+from timeline_stream import iter_members
+
+Level = IntEnum('Level', {name.upper(): code for name, code in LEVEL_CODES.items()})
+
+_LEVEL_BY_NAME = {name: Level(code) for name, code in LEVEL_CODES.items()}
+_shapes: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_getters: Dict[Tuple[type, Tuple[str, ...]], Callable[[Any], Tuple[Any, ...]]] = {}
+
+
+def _shape(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    """One shared tuple per distinct key layout."""
+    return _shapes.setdefault(keys, keys)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_json(value: Any) -> Any:
+    """A parsed JSON value with every string and object key in it interned."""
+    kind = type(value)
+    if kind is str:
+        return sys.intern(value)
+    if kind is dict:
+        return {sys.intern(key): _intern_json(item) for key, item in value.items()}
+    if kind is list:
+        return [_intern_json(item) for item in value]
+    return value
+
+
+def _level(value: Any) -> Any:
+    # Unknown or non-string levels are kept verbatim
+    return _LEVEL_BY_NAME.get(value, value) if type(value) is str else value
+
+
+class _Model:
+    """Anything in the model that serializes back to plain JSON values; each subclass defines to_json()."""
+    __slots__ = ()
+
+
+def _plain(value: Any) -> Any:
+    return value.to_json() if isinstance(value, _Model) else value
+
+
+class _Record(_Model, MutableMapping):
+    """A JSON object with one slot per known key."""
+    __slots__ = ('_keys', '_extra')
+
+    FIELDS: Dict[str, str] = {}                        # JSON key -> slot name
+    DECODERS: Dict[str, Callable[[Any], Any]] = {}     # JSON key -> conversion into the slot
+
+    @classmethod
+    def from_json(cls, obj: Any) -> Any:
+        """Record for a decoded JSON object; anything else (or an existing record) is returned as is."""
+        if type(obj) is not dict:
+            return obj
+        record = cls.__new__(cls)
+        fields, decoders = cls.FIELDS, cls.DECODERS
+        extra = None
+        for key, value in obj.items():
+            slot = fields.get(key)
+            if slot is None:
+                if extra is None:
+                    extra = {}
+                extra[sys.intern(key)] = _intern_json(value)
+            else:
+                decode = decoders.get(key)
+                setattr(record, slot, decode(value) if decode else value)
+        record._keys = _shape(tuple(obj))
+        record._extra = extra
+        return record
+
+    def _encode(self, key: str, value: Any) -> Any:
+        """The JSON value of a slot's content."""
+        return value
+
+    def _as_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the record's JSON members; nested records are left as they are."""
+        keys, fields, extra = self._keys, self.FIELDS, self._extra
+        if extra is None and len(keys) > 1:
+            # Records without extra keys read all their slots in one C call per key layout
+            getter = _getters.get((type(self), keys))
+            if getter is None:
+                getter = _getters[type(self), keys] = attrgetter(*(fields[key] for key in keys))
+            return dict(zip(keys, getter(self)))
+        return {key: getattr(self, fields[key]) if key in fields else extra[key] for key in keys}
+
+    def to_json(self) -> Dict[str, Any]:
+        return {key: _plain(value) for key, value in self._as_dict().items()}
+
+    def items(self):
+        return self._as_dict().items()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        slot = self.FIELDS.get(key)
+        if slot is None:
+            return self._extra[key]
+        return self._encode(key, getattr(self, slot))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self._keys else default
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        slot = self.FIELDS.get(key)
+        if slot is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+        else:
+            decode = self.DECODERS.get(key)
+            setattr(self, slot, decode(value) if decode else value)
+        if key not in self._keys:
+            self._keys = _shape(self._keys + (key,))
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._keys:
+            raise KeyError(key)
+        slot = self.FIELDS.get(key)
+        if slot is None:
+            del self._extra[key]
+        else:
+            delattr(self, slot)
+        self._keys = _shape(tuple(k for k in self._keys if k != key))
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_json()!r})"
+
+
+class _RecordList(_Model, list):
+    """A JSON array of records that converts dicts added to it."""
+    __slots__ = ()
+
+    RECORD: type = _Record
+
+    def __init__(self, items: Iterable[Any] = ()):
+        super().__init__(map(self.RECORD.from_json, items))
+
+    def append(self, item: Any) -> None:
+        super().append(self.RECORD.from_json(item))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        super().extend(map(self.RECORD.from_json, items))
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, self.RECORD.from_json(item))
+
+    def __setitem__(self, index, item) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, map(self.RECORD.from_json, item))
+        else:
+            super().__setitem__(index, self.RECORD.from_json(item))
+
+    def to_json(self) -> List[Any]:
+        return [_plain(item) for item in self]
+
+
+def _list_of(list_type: type) -> Callable[[Any], Any]:
+    return lambda value: list_type(value) if type(value) is list else value
+
+
+class Stage(_Record):
+    """One step of a main_path or pivot: a role with its level, timing and salary."""
+
+    FIELDS = {
+        'title': 'title',
+        'shortTitle': 'short_title',
+        'level': 'level',
+        'cumulativeYears': 'cumulative_years',
+        'salary': 'salary',
+        'timeToNext': 'time_to_next',
+        'typicalPhDEntry': 'typical_phd_entry',
+        'phdAccelerated': 'phd_accelerated',
+        'phdTimeToNext': 'phd_time_to_next',
+        'phdRecommended': 'phd_recommended',
+        'industryDemand': 'industry_demand',
+        'remoteFriendly': 'remote_friendly',
+    }
+    DECODERS = {'title': _intern, 'shortTitle': _intern, 'level': _level, 'salary': _intern,
+                'industryDemand': _intern}
+    __slots__ = tuple(FIELDS.values())
+
+    def _encode(self, key: str, value: Any) -> Any:
+        return LEVELS[value] if type(value) is Level else value
+
+    def _as_dict(self) -> Dict[str, Any]:
+        members = super()._as_dict()
+        if type(members.get('level')) is Level:
+            members['level'] = LEVELS[members['level']]
+        return members
+
+    # Stages hold no nested records
+    to_json = _as_dict
+
+
+class StageList(_RecordList):
+    __slots__ = ()
+    RECORD = Stage
+
+
+class Pivot(_Record):
+    """A branch off main_path with its own stages."""
+
+    FIELDS = {
+        'branchFromIndex': 'branch_from_index',
+        'branchName': 'branch_name',
+        'color': 'color',
+        'transitionSuccess': 'transition_success',
+        'stages': 'stages',
+    }
+    DECODERS = {'branchName': _intern, 'color': _intern, 'transitionSuccess': _intern,
+                'stages': _list_of(StageList)}
+    __slots__ = tuple(FIELDS.values())
+
+
+class PivotList(_RecordList):
+    __slots__ = ()
+    RECORD = Pivot
+
+
+class Career(_Record):
+    """One career_timelines entry. Descriptive members without a slot are kept as (interned) JSON."""
+
+    FIELDS = {
+        'name': 'name',
+        'targetIndustries': 'target_industries',
+        'main_path': 'main_path',
+        'pivot_opportunities': 'pivot_opportunities',
+    }
+    DECODERS = {'name': _intern, 'targetIndustries': _intern_json,
+                'main_path': _list_of(StageList), 'pivot_opportunities': _list_of(PivotList)}
+    __slots__ = tuple(FIELDS.values())
+
+
+class CareerMap(_Model, dict):
+    """career_timelines: career key -> Career."""
+    __slots__ = ()
+
+    def __init__(self, careers: Iterable[Tuple[str, Any]] = ()):
+        super().__init__((key, Career.from_json(career)) for key, career in careers)
+
+    def __setitem__(self, key: str, career: Any) -> None:
+        super().__setitem__(key, Career.from_json(career))
+
+    def to_json(self) -> Dict[str, Any]:
+        return {key: _plain(career) for key, career in self.items()}
+
+
+class Dataset(_Record):
+    """A whole timeline file. Top-level members other than career_timelines are kept as JSON."""
+
+    FIELDS = {'career_timelines': 'career_timelines'}
+    DECODERS = {'career_timelines': lambda value: CareerMap(value.items()) if type(value) is dict else value}
+    __slots__ = tuple(FIELDS.values())
+
+
+def from_json(data: Dict[str, Any]) -> Dataset:
+    """Model of an already parsed dataset."""
+    return Dataset.from_json(data)
+
+
+def load_model(file_path: str = DEFAULT_DATA_PATH) -> Dataset:
+    """Read a dataset file straight into the model, one career at a time."""
+    members = {}
+    for key, value in iter_members(file_path):
+        members[key] = CareerMap(value) if key == 'career_timelines' else value
+    return Dataset.from_json(members)
+
+
+def dump_model(dataset: Dataset) -> str:
+    """Serialize exactly like timeline_io.dump_dataset, converting one career at a time."""
+    def member(key: str, value: Any) -> str:
+        if key == 'career_timelines' and isinstance(value, dict) and value:
+            careers = ',\n'.join(f"    {json.dumps(career_key, ensure_ascii=False)}: {dump_block(_plain(career), 2)}"
+                                  for career_key, career in value.items())
+            text = '{\n' + careers + '\n  }'
+        else:
+            text = dump_block(_plain(value), 1)
+        return f"  {json.dumps(key, ensure_ascii=False)}: {text}"
+
+    if not len(dataset):
+        return '{}'
+    return '{\n' + ',\n'.join(member(key, value) for key, value in dataset.items()) + '\n}'
+
+
+if __name__ == '__main__':
+    import tracemalloc
+    from timeline_io import dump_dataset, load_dataset
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATA_PATH
+    tracemalloc.start()
+    data = load_dataset(file_path)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    text = dump_dataset(data)
+    del data
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    model = load_model(file_path)
+    model_bytes, model_peak = (n - base for n in tracemalloc.get_traced_memory())
+    print(f"dicts: {dict_bytes / 1e6:,.1f} MB, model: {model_bytes / 1e6:,.1f} MB "
+          f"(peak while loading {model_peak / 1e6:,.1f} MB)")
+    print('round trip: ' + ('identical' if dump_model(model) == text else 'DIFFERS'))
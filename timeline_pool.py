@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Sharding shared by the scripts that spread careers across a process pool
+(validate_timelines.py, restore_pivots.py).
+
+Careers are cut into SHARD_SIZE shards in file order and the results are
+consumed in the same order, so parallel output matches a serial run. Smaller
+inputs, or a single worker, stay in-process.
+"""
+
+import os
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TypeVar
+
+# Below this many careers a process pool costs more than it saves
+PARALLEL_THRESHOLD = 2000
+SHARD_SIZE = 1000
+
+T = TypeVar('T')
+
+
+def pool_workers(workers: Optional[int], career_count: int) -> int:
+    """Worker processes to use for career_count careers; 1 means run serially.
+
+    workers defaults to the CPU count. Callers that stream may pass the number
+    of careers seen so far, up to PARALLEL_THRESHOLD.
+    """
+    if career_count < PARALLEL_THRESHOLD:
+        return 1
+    return workers or os.cpu_count() or 1
+
+
+def shards(items: Iterable[T], size: int = SHARD_SIZE) -> Iterator[List[T]]:
+    """Consecutive lists of up to size items, read lazily from items."""
+    items = iter(items)
+    while True:
+        shard = list(islice(items, size))
+        if not shard:
+            return
+        yield shard
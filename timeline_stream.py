@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Incremental reader for career timeline JSON files.
+
+Walks the top-level document and yields one (career_key, career_data) pair at a
+time from `career_timelines`, so memory stays bounded by the largest single
+career block rather than the size of the file.
+
+NDJSON datasets (.ndjson/.jsonl, as written by timeline_writer.py) are read
+the same way: one career per line, with the other top-level members taken from
+the <name>.header.json file next to them.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+DEFAULT_CHUNK_SIZE = 1 << 16
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+_decoder = json.JSONDecoder()
+
+
+Span = Tuple[int, int]
+
+
+class JsonReader:
+    """Incremental JSON tokenizer over a sliding text window.
+
+    Reads from a file in chunks refilled on demand, or over a whole string
+    (from_text). Positions reported by offset and value_span() are absolute
+    offsets into the text, whichever way it is read. This is the one member
+    walker shared by the streaming readers here and timeline_blocks.py.
+    """
+
+    def __init__(self, f=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.base = 0  # offset of buf[0] in the whole text
+        self.eof = f is None
+
+    @classmethod
+    def from_text(cls, text: str, idx: int = 0) -> 'JsonReader':
+        reader = cls()
+        reader.buf = text
+        reader.pos = idx
+        return reader
+
+    @property
+    def offset(self) -> int:
+        return self.base + self.pos
+
+    def fill(self, min_size: int = 0) -> bool:
+        """Read more text, discarding what has already been consumed."""
+        if self.eof:
+            return False
+        if self.pos:
+            self.base += self.pos
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(max(self.chunk_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def skip_ws(self) -> None:
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.fill():
+                return
+
+    def peek(self) -> str:
+        self.skip_ws()
+        return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def _decode(self, decode):
+        self.skip_ws()
+        while True:
+            try:
+                value, end = decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Grow geometrically so a large block is re-scanned O(log n) times
+                if not self.fill(len(self.buf) - self.pos):
+                    raise
+                continue
+            # A number cut by the window edge ("1." or "1.5e-" of "1.5e-7") decodes
+            # short, leaving only number characters up to the edge
+            if not self.eof and NUMBER_TAIL.match(self.buf, end) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def string(self) -> str:
+        def decode(text, idx):
+            if text[idx:idx + 1] != '"':
+                raise json.JSONDecodeError("Expecting '\"'", text, idx)
+            return json.decoder.scanstring(text, idx + 1)
+        return self._decode(decode)
+
+    def value(self) -> Any:
+        return self._decode(_decoder.raw_decode)
+
+    def value_span(self) -> Tuple[Any, Span]:
+        """Decode the next value, with the absolute span of its text."""
+        self.skip_ws()
+        start = self.offset
+        value = self.value()
+        return value, (start, self.offset)
+
+    def members(self) -> Iterator[str]:
+        """Yield object keys; the caller must consume each value before resuming."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.string()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+
+def is_ndjson(file_path: str) -> bool:
+    return os.path.splitext(file_path)[1].lower() in NDJSON_EXTENSIONS
+
+
+def ndjson_header_path(file_path: str) -> str:
+    """The file holding an NDJSON dataset's non-career top-level members."""
+    return os.path.splitext(file_path)[0] + '.header.json'
+
+
+def iter_ndjson_careers(file_path: str) -> Iterator[Tuple[str, Any]]:
+    """Yield (career_key, career_data) from an NDJSON file, one {"<key>": {...}} line at a time."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield from json.loads(line).items()
+
+
+def _iter_ndjson_members(file_path: str) -> Iterator[Tuple[str, Any]]:
+    header_path = ndjson_header_path(file_path)
+    header = {}
+    if os.path.exists(header_path):
+        with open(header_path, 'r', encoding='utf-8') as f:
+            header = json.load(f)
+    # career_timelines is null in the header, marking where the careers belong
+    header.setdefault('career_timelines', None)
+    for key, value in header.items():
+        yield key, iter_ndjson_careers(file_path) if key == 'career_timelines' else value
+
+
+def iter_members(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) for each top-level member of a timeline file, in file order.
+
+    `career_timelines` is yielded as an iterator of (career_key, career_data)
+    pairs rather than decoded whole; careers left unconsumed when the caller
+    resumes are skipped.
+    """
+    if is_ndjson(file_path):
+        yield from _iter_ndjson_members(file_path)
+        return
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = JsonReader(f, chunk_size)
+        for key in text.members():
+            if key != 'career_timelines':
+                yield key, text.value()
+                continue
+            careers = ((career_key, text.value()) for career_key in text.members())
+            yield key, careers
+            for _ in careers:
+                pass
+
+
+def iter_career_timelines(file_path: str, header: Optional[Dict[str, Any]] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (career_key, career_data) pairs from a timeline file one career at a time.
+
+    Other top-level members (e.g. `metadata`) are decoded whole and stored in
+    `header` if a dict is given.
+    """
+    for key, value in iter_members(file_path, chunk_size):
+        if key == 'career_timelines':
+            yield from value
+        elif header is not None:
+            header[key] = value
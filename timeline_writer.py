@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Streaming output for career timeline datasets.
+
+Careers are written as they are produced rather than serializing a finished
+document, in one of three formats:
+
+    pretty   2-space indented JSON, byte-identical to timeline_io.dump_dataset
+    compact  the same document without whitespace
+    ndjson   one {"<career_key>": {...}} object per line; the other top-level
+             members go to <name>.header.json, with career_timelines null
+             marking where the careers belong
+
+Output is collected into batches of about BUFFER_SIZE characters per write
+call, and the finished files replace their targets atomically on close.
+Files ending in .ndjson or .jsonl are written as ndjson, everything else as
+pretty (the default) or compact JSON; readers go by the extension, so other
+combinations are refused. timeline_stream.iter_members reads all three back.
+"""
+
+import json
+import os
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+from timeline_blocks import dump_block
+from timeline_io import dump_dataset, encode_mapping, write_text
+from timeline_stream import NDJSON_EXTENSIONS, is_ndjson, iter_members, ndjson_header_path
+
+FORMATS = ('pretty', 'compact', 'ndjson')
+BUFFER_SIZE = 1 << 20
+CAREER_CONTAINER = 'career_timelines'
+
+
+def format_for_path(file_path: str, fmt: Optional[str] = None) -> str:
+    """The format to write file_path in. Readers pick the format by extension, so fmt must agree with it."""
+    if fmt is not None and fmt not in FORMATS:
+        raise ValueError(f"unknown output format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    if fmt is None:
+        return 'ndjson' if is_ndjson(file_path) else 'pretty'
+    if (fmt == 'ndjson') != is_ndjson(file_path):
+        expected = 'ndjson' if is_ndjson(file_path) else 'pretty or compact'
+        raise ValueError(f"cannot write {fmt} to {file_path}: files ending in {' or '.join(NDJSON_EXTENSIONS)} "
+                         f"hold ndjson, others JSON (expected {expected})")
+    return fmt
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=encode_mapping)
+
+
+class DatasetWriter:
+    """Writes one dataset member by member, in document order.
+
+    Call member() for each top-level member and begin_careers() then career()
+    for each career where career_timelines belongs; close() (or leaving the
+    `with` block) finishes the files. In ndjson format the header is written
+    on close, so members may still be changed until then.
+    """
+
+    def __init__(self, file_path: str, fmt: Optional[str] = None, buffer_size: int = BUFFER_SIZE):
+        self.file_path = file_path
+        self.fmt = format_for_path(file_path, fmt)
+        self.buffer_size = buffer_size
+        self.careers = 0
+        self.header: Dict[str, Any] = {}
+        self._tmp_path = file_path + '.tmp'
+        self._f = open(self._tmp_path, 'w', encoding='utf-8')
+        self._chunks: List[str] = []
+        self._buffered = 0
+        self._members = 0
+        self._in_careers = False
+        if self.fmt != 'ndjson':
+            self._write('{')
+
+    def __enter__(self) -> 'DatasetWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write(self, text: str) -> None:
+        self._chunks.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.buffer_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._f.write(''.join(self._chunks))
+        self._chunks = []
+        self._buffered = 0
+
+    def _key(self, key: str, indent: str) -> str:
+        if self.fmt == 'pretty':
+            return f"{indent}{json.dumps(key, ensure_ascii=False)}: "
+        return json.dumps(key, ensure_ascii=False) + ':'
+
+    def _open_member(self, key: str) -> None:
+        self._end_careers()
+        self._write((',' if self._members else '') + self._key(key, '\n  '))
+        self._members += 1
+
+    def member(self, key: str, value: Any) -> None:
+        """Write a top-level member other than career_timelines."""
+        if self.fmt == 'ndjson':
+            self._end_careers()
+            self.header[key] = value
+            return
+        self._open_member(key)
+        self._write(dump_block(value, 1) if self.fmt == 'pretty' else compact_json(value))
+
+    def begin_careers(self) -> None:
+        """Start career_timelines at this position; career() calls it if needed."""
+        if self.fmt == 'ndjson':
+            self.header[CAREER_CONTAINER] = None
+        else:
+            self._open_member(CAREER_CONTAINER)
+            self._write('{')
+        self._in_careers = True
+
+    def career(self, career_key: str, career: Any) -> None:
+        if not self._in_careers:
+            self.begin_careers()
+        if self.fmt == 'ndjson':
+            self._write(compact_json({career_key: career}) + '\n')
+        else:
+            body = dump_block(career, 2) if self.fmt == 'pretty' else compact_json(career)
+            self._write((',' if self.careers else '') + self._key(career_key, '\n    ') + body)
+        self.careers += 1
+
+    def _end_careers(self) -> None:
+        if self._in_careers and self.fmt != 'ndjson':
+            self._write('\n  }' if self.fmt == 'pretty' and self.careers else '}')
+        self._in_careers = False
+
+    def close(self) -> None:
+        self._end_careers()
+        if self.fmt != 'ndjson':
+            self._write('\n}' if self.fmt == 'pretty' and self._members else '}')
+        self._flush()
+        self._f.close()
+        if self.fmt == 'ndjson':
+            write_text(dump_dataset(self.header), ndjson_header_path(self.file_path))
+        os.replace(self._tmp_path, self.file_path)
+
+    def abort(self) -> None:
+        """Discard everything written; the target files are left untouched."""
+        self._f.close()
+        os.remove(self._tmp_path)
+
+
+def write_dataset(data: Dict[str, Any], file_path: str, fmt: Optional[str] = None) -> None:
+    """Write an in-memory dataset in the given (or path-implied) format."""
+    with DatasetWriter(file_path, fmt) as writer:
+        for key, value in data.items():
+            if key == CAREER_CONTAINER and isinstance(value, dict):
+                writer.begin_careers()
+                for career_key, career in value.items():
+                    writer.career(career_key, career)
+            else:
+                writer.member(key, value)
+
+
+def stream_transform(input_path: str, output_path: str,
+                     transform: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+                     fmt: Optional[str] = None,
+                     update_member: Optional[Callable[[str, Any], Any]] = None) -> int:
+    """Copy a dataset career by career, passing each through transform(career_key, career_data).
+
+    Memory stays bounded by one career. update_member(key, value), if given,
+    may rewrite the other top-level members (e.g. metadata). Input and output
+    may be the same file. Returns the number of careers written.
+    """
+    def transform_careers(careers: Iterator[Tuple[str, Any]]) -> Iterator[Tuple[str, Any]]:
+        return ((career_key, transform(career_key, career)) for career_key, career in careers)
+    return stream_transform_careers(input_path, output_path, transform_careers, fmt, update_member)
+
+
+def stream_transform_careers(input_path: str, output_path: str,
+                             transform_careers: Callable[[Iterator[Tuple[str, Any]]], Iterator[Tuple[str, Any]]],
+                             fmt: Optional[str] = None,
+                             update_member: Optional[Callable[[str, Any], Any]] = None) -> int:
+    """Like stream_transform, but transform_careers maps the whole (career_key, career_data) stream.
+
+    Lets a transform work on batches of careers (e.g. in a process pool) as
+    long as it yields them back lazily and in order.
+    """
+    with DatasetWriter(output_path, fmt) as writer:
+        for key, value in iter_members(input_path):
+            if key == CAREER_CONTAINER:
+                writer.begin_careers()
+                for career_key, career in transform_careers(value):
+                    writer.career(career_key, career)
+            else:
+                writer.member(key, update_member(key, value) if update_member else value)
+        return writer.careers
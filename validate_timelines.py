@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Validator for the career timeline dataset invariants.
+
+Every stage list (main_path and each pivot's stages) is checked in a single
+pass per career:
+
+- cumulativeYears is a number and never decreases along the list
+- timeToNext equals the next stage's cumulativeYears minus this stage's,
+  and is null on the last stage
+- salary parses as a "$min-$max" range with min <= max
+- each pivot's branchFromIndex is an integer within main_path
+
+Violations are reported as JSON lines carrying the career key and a JSON
+pointer to the offending value. Large files are validated in parallel, with
+careers sharded across a process pool.
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+
+from salary_ranges import SalaryParseError, parse_salary_range
+from timeline_io import DEFAULT_DATA_PATH, load_dataset
+from timeline_pool import pool_workers, shards
+
+YEARS_TOLERANCE = 1e-6
+# JSON objects: plain dicts, or the records of timeline_model.py
+OBJECT_TYPES = (dict, Mapping)
+
+
+class Violation(NamedTuple):
+    career: str
+    pointer: str
+    rule: str
+    message: str
+
+    def as_json(self) -> str:
+        return json.dumps(self._asdict(), ensure_ascii=False)
+
+
+def pointer(*parts: Any) -> str:
+    """RFC 6901 JSON pointer for a path of keys and indexes."""
+    return ''.join('/' + str(part).replace('~', '~0').replace('/', '~1') for part in parts)
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_stages(career_key: str, base: Tuple[Any, ...], stages: Any) -> List[Violation]:
+    """Violations within one stage list; base is the pointer path of the list."""
+    if not isinstance(stages, list):
+        return [Violation(career_key, pointer(*base), 'type', 'stage list must be an array')]
+    violations = []
+    last = len(stages) - 1
+    previous_years = None
+    for i, stage in enumerate(stages):
+        path = base + (i,)
+        if not isinstance(stage, OBJECT_TYPES):
+            violations.append(Violation(career_key, pointer(*path), 'type', 'stage must be an object'))
+            previous_years = None
+            continue
+
+        years = stage.get('cumulativeYears')
+        if not is_number(years):
+            violations.append(Violation(career_key, pointer(*path, 'cumulativeYears'), 'cumulative-years',
+                                        f"cumulativeYears must be a number, got {years!r}"))
+            years = None
+        elif previous_years is not None and years < previous_years:
+            violations.append(Violation(career_key, pointer(*path, 'cumulativeYears'), 'cumulative-years',
+                                        f"cumulativeYears {years} is before the previous stage's {previous_years}"))
+
+        time_to_next = stage.get('timeToNext')
+        if i == last:
+            if time_to_next is not None:
+                violations.append(Violation(career_key, pointer(*path, 'timeToNext'), 'time-to-next',
+                                            f"last stage has timeToNext {time_to_next!r}, expected null"))
+        elif not is_number(time_to_next):
+            violations.append(Violation(career_key, pointer(*path, 'timeToNext'), 'time-to-next',
+                                        f"timeToNext must be a number before the last stage, got {time_to_next!r}"))
+        else:
+            next_stage = stages[i + 1]
+            next_years = next_stage.get('cumulativeYears') if isinstance(next_stage, OBJECT_TYPES) else None
+            if years is not None and is_number(next_years) and \
+                    abs(years + time_to_next - next_years) > YEARS_TOLERANCE:
+                violations.append(Violation(career_key, pointer(*path, 'timeToNext'), 'time-to-next',
+                                            f"timeToNext {time_to_next} does not reach the next stage "
+                                            f"({years} + {time_to_next} != {next_years})"))
+
+        if 'salary' not in stage:
+            violations.append(Violation(career_key, pointer(*path, 'salary'), 'salary', 'salary is missing'))
+        else:
+            try:
+                minimum, maximum, _ = parse_salary_range(stage['salary'])
+            except SalaryParseError as e:
+                violations.append(Violation(career_key, pointer(*path, 'salary'), 'salary', str(e)))
+            else:
+                if minimum > maximum:
+                    violations.append(Violation(career_key, pointer(*path, 'salary'), 'salary',
+                                                f"salary minimum exceeds maximum in {stage['salary']!r}"))
+
+        previous_years = years
+    return violations
+
+
+def check_career(career_key: str, career_data: Any) -> List[Violation]:
+    """All violations for one career, in document order."""
+    base = ('career_timelines', career_key)
+    if not isinstance(career_data, OBJECT_TYPES):
+        return [Violation(career_key, pointer(*base), 'type', 'career must be an object')]
+    main_path = career_data.get('main_path', [])
+    violations = check_stages(career_key, base + ('main_path',), main_path)
+    main_length = len(main_path) if isinstance(main_path, list) else 0
+
+    pivots = career_data.get('pivot_opportunities', [])
+    if not isinstance(pivots, list):
+        return violations + [Violation(career_key, pointer(*base, 'pivot_opportunities'), 'type',
+                                       'pivot_opportunities must be an array')]
+    for p, pivot in enumerate(pivots):
+        path = base + ('pivot_opportunities', p)
+        if not isinstance(pivot, OBJECT_TYPES):
+            violations.append(Violation(career_key, pointer(*path), 'type', 'pivot must be an object'))
+            continue
+        index = pivot.get('branchFromIndex')
+        if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < main_length:
+            violations.append(Violation(career_key, pointer(*path, 'branchFromIndex'), 'branch-index',
+                                        f"branchFromIndex {index!r} is outside main_path (0-{main_length - 1})"))
+        violations.extend(check_stages(career_key, path + ('stages',), pivot.get('stages', [])))
+    return violations
+
+
+def check_shard(careers: List[Tuple[str, Any]], fail_fast: bool = False) -> List[Violation]:
+    violations = []
+    for career_key, career_data in careers:
+        violations.extend(check_career(career_key, career_data))
+        if fail_fast and violations:
+            break
+    return violations
+
+
+def validate_timelines(careers: Dict[str, Any], workers: Optional[int] = None,
+                       fail_fast: bool = False) -> List[Violation]:
+    """Violations for a career_timelines mapping, in career order.
+
+    With fail_fast, stops at the first career with a violation; in parallel
+    runs, shards already in flight may still finish but only the first
+    failing shard's violations are returned.
+    """
+    workers = pool_workers(workers, len(careers))
+    if workers == 1:
+        return check_shard(list(careers.items()), fail_fast)
+
+    violations = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(check_shard, shard, fail_fast) for shard in shards(careers.items())]
+        for future in futures:
+            violations.extend(future.result())
+            if fail_fast and violations:
+                for pending in futures:
+                    pending.cancel()
+                break
+    return violations
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Validate a dataset file and write violations as JSON lines."""
+    parser = argparse.ArgumentParser(description='Check career timeline dataset invariants.')
+    parser.add_argument('file_path', nargs='?', default=DEFAULT_DATA_PATH, help='career timeline JSON file')
+    parser.add_argument('-o', '--output', help='write violations here instead of stdout')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count; 1 disables the pool)')
+    parser.add_argument('--fail-fast', action='store_true', help='stop at the first career with a violation')
+    args = parser.parse_args(argv)
+
+    careers = load_dataset(args.file_path).get('career_timelines', {})
+    violations = validate_timelines(careers, args.workers, args.fail_fast)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for violation in violations:
+            out.write(violation.as_json() + '\n')
+    finally:
+        if args.output:
+            out.close()
+
+    rules = {}
+    for violation in violations:
+        rules[violation.rule] = rules.get(violation.rule, 0) + 1
+    summary = ', '.join(f"{rule}: {count}" for rule, count in sorted(rules.items()))
+    print(f"{len(violations)} violations in {len(careers)} careers" + (f" ({summary})" if summary else ''),
+          file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())